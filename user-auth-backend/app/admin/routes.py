@@ -0,0 +1,86 @@
+import asyncio
+import io
+import json
+import tempfile
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.deps.auth import require_admin
+from app.services.user_import import FORMATS, ImportReport, import_users
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+# Each import owns a process pool, so they are limited per API worker
+_import_slots = asyncio.Semaphore(settings.IMPORT_ENDPOINT_MAX_CONCURRENT)
+
+
+@router.post("/users/import")
+async def import_users_endpoint(request: Request, format: str = Query("csv")):
+    """
+    Bulk-create users from a CSV or NDJSON request body (see
+    app/services/user_import.py). The response is NDJSON: a ``progress``
+    line after every batch, then one ``done`` line with the per-row errors.
+
+    The import keeps running if the client disconnects. Hashing uses
+    IMPORT_ENDPOINT_HASH_WORKERS processes; for large files on a dedicated
+    machine, use ``python -m app.services.user_import`` instead.
+    """
+    if format not in FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"format must be one of: {', '.join(FORMATS)}"
+        )
+    if _import_slots.locked():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="An import is already running; try again when it finishes"
+        )
+    await _import_slots.acquire()
+
+    # Spool the upload first: the importer reads synchronously in a thread,
+    # and large files go to disk instead of memory
+    upload = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+    try:
+        async for chunk in request.stream():
+            upload.write(chunk)
+    except BaseException:
+        # Client went away mid-upload; the import never starts
+        upload.close()
+        _import_slots.release()
+        raise
+    upload.seek(0)
+
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+
+    def on_progress(report: ImportReport) -> None:
+        counts = {"rows": report.rows, "created": report.created,
+                  "skipped_existing": report.skipped_existing, "failed": report.failed}
+        loop.call_soon_threadsafe(events.put_nowait, {"event": "progress", **counts})
+
+    def run() -> ImportReport:
+        with upload, io.TextIOWrapper(upload, encoding="utf-8", newline="") as stream:
+            return import_users(
+                stream, format, workers=settings.IMPORT_ENDPOINT_HASH_WORKERS, on_progress=on_progress
+            )
+
+    def finished(_) -> None:
+        _import_slots.release()
+        events.put_nowait(None)
+
+    task = asyncio.ensure_future(run_in_threadpool(run))
+    task.add_done_callback(finished)
+
+    async def stream_events():
+        while (event := await events.get()) is not None:
+            yield json.dumps(event) + "\n"
+        try:
+            yield json.dumps({"event": "done", **task.result().to_dict()}) + "\n"
+        except Exception as e:
+            print(f"Error importing users: {e}")
+            yield json.dumps({"event": "error", "detail": "Import failed"}) + "\n"
+
+    return StreamingResponse(stream_events(), media_type="application/x-ndjson")
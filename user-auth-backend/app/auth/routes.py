@@ -1,24 +1,49 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy.orm import Session
+from pydantic import TypeAdapter
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.deps.auth import get_current_user
-from app.deps.db import get_db
+from app.deps.db import get_async_db
+from app.db.session import AsyncSessionLocal
 from app.models.user import User
-from app.auth.schemas import SignUpIn, TokenOut, UserOut
-from app.core.security import hash_password, verify_password, create_access_token, decode_access_token
+from app.auth.schemas import SignUpIn, TokenOut, UserOut, UploadUrlOut, UploadUrlBatchIn, UploadUrlBatchOut
+from app.core.security import hash_password_async, verify_password_async, create_access_token, decode_access_token
+from app.core.security import password_needs_rehash
+from app.core.hashing import HashingBusyError
 from app.auth.schemas import PasswordResetRequestIn, PasswordResetIn
 from app.core.security import create_password_reset_token, decode_password_reset_token
-from app.services.storage import supabase_client
+from app.core.config import settings
+from app.core.rate_limit import RateLimit
+from app.core.responses import RawJSONResponse, dump_model
+from app.core.user_cache import CachedUser, invalidate_cached_user
+from app.services.upload_storage import create_signed_upload_urls, get_upload_storage
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 bearer = HTTPBearer(auto_error=False)
+_user_out_adapter = TypeAdapter(UserOut)
 
+# Run as route-level dependencies, i.e. before the session dependency and any
+# bcrypt work, so a flood is turned away at the cost of one Redis call.
+signup_rate_limit = RateLimit("signup", per_ip=settings.RATE_LIMIT_SIGNUP_PER_IP)
+login_rate_limit = RateLimit(
+    "login", per_ip=settings.RATE_LIMIT_LOGIN_PER_IP, per_email=settings.RATE_LIMIT_LOGIN_PER_EMAIL
+)
+password_reset_rate_limit = RateLimit(
+    "password-reset",
+    per_ip=settings.RATE_LIMIT_PASSWORD_RESET_PER_IP,
+    per_email=settings.RATE_LIMIT_PASSWORD_RESET_PER_EMAIL
+)
 
-@router.post("/signup", response_model=UserOut, status_code=status.HTTP_201_CREATED)
-def signup(payload: SignUpIn, db: Session = Depends(get_db)):
+
+@router.post(
+    "/signup", response_model=UserOut, status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(signup_rate_limit)]
+)
+async def signup(payload: SignUpIn, db: AsyncSession = Depends(get_async_db)):
     # Validate password length (bcrypt limit)
     if len(payload.password.encode('utf-8')) > 72:
         raise HTTPException(
@@ -27,26 +52,29 @@ def signup(payload: SignUpIn, db: Session = Depends(get_db)):
         )
     
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == payload.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == payload.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
+    # Hash outside the try block so a full hashing queue surfaces as 503, not 500
+    hashed_password = await hash_password_async(payload.password)
+
     # Create new user
     try:
-        user = User(email=payload.email, hashed_password=hash_password(payload.password))
+        user = User(email=payload.email, hashed_password=hashed_password)
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
         
         # FIX: Return the ORM object directly. Pydantic's 'from_attributes = True' 
         # (formerly from_orm) will automatically map all fields (id, email, is_active, created_at)
         return user
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         # Log the exception for debugging on your side
         print(f"Error during user creation: {e}") 
         raise HTTPException(
@@ -55,33 +83,67 @@ def signup(payload: SignUpIn, db: Session = Depends(get_db)):
         )
 
 
-@router.post("/login", response_model=TokenOut)
-def login(payload: SignUpIn, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == payload.email).first()
-    if not user or not verify_password(payload.password, user.hashed_password):
+@router.post("/login", response_model=TokenOut, dependencies=[Depends(login_rate_limit)])
+async def login(
+        payload: SignUpIn,
+        background_tasks: BackgroundTasks,
+        db: AsyncSession = Depends(get_async_db)
+):
+    user = await db.scalar(select(User).where(User.email == payload.email))
+    if not user or not await verify_password_async(payload.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
         )
+
+    if password_needs_rehash(user.hashed_password):
+        # After the response is sent, so the login itself pays no extra hash
+        background_tasks.add_task(_rehash_password, user.id, payload.password, user.hashed_password)
     
     token = create_access_token(sub=str(user.id))
     return TokenOut(access_token=token)
 
+async def _rehash_password(user_id: int, password: str, old_hash: str) -> None:
+    """Store the password again with the current bcrypt cost."""
+    try:
+        new_hash = await hash_password_async(password)
+    except HashingBusyError:
+        # Busy: the next login will try again
+        return
+    try:
+        async with AsyncSessionLocal() as db:
+            # Only replace the hash we verified, not one a reset just wrote
+            await db.execute(
+                update(User)
+                .where(User.id == user_id, User.hashed_password == old_hash)
+                .values(hashed_password=new_hash)
+            )
+            await db.commit()
+    except Exception as e:
+        print(f"Error re-hashing password for user {user_id}: {e}")
+
+
 @router.get("/me", response_model=UserOut)
-def me(current_user: User = Depends(get_current_user)):
+async def me(current_user: CachedUser = Depends(get_current_user)):
+    if settings.FAST_RESPONSES_ENABLED:
+        return RawJSONResponse(dump_model(
+            _user_out_adapter, UserOut,
+            id=current_user.id, email=current_user.email,
+            is_active=current_user.is_active, created_at=current_user.created_at
+        ))
     return current_user
 
 @router.post("/test")
-def test_endpoint():
+async def test_endpoint():
     return {"msg": "Test endpoint is working!"}
 
-@router.post("/request-password-reset")
-def request_password_reset(
+@router.post("/request-password-reset", dependencies=[Depends(password_reset_rate_limit)])
+async def request_password_reset(
         payload: PasswordResetRequestIn,
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ):
     try:
-        user = db.query(User).filter(User.email == payload.email).first()
+        user = await db.scalar(select(User).where(User.email == payload.email))
     except Exception as e:
         print(f"Database error during password reset request: {e}")
         raise HTTPException(
@@ -110,9 +172,9 @@ def request_password_reset(
 
 
 @router.post("/reset-password")
-def reset_password(
+async def reset_password(
         payload: PasswordResetIn,
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ):
     email = decode_password_reset_token(payload.token)
     if not email:
@@ -121,7 +183,7 @@ def reset_password(
             detail="Invalid or expired token"
         )
 
-    user = db.query(User).filter(User.email == email).first()
+    user = await db.scalar(select(User).where(User.email == email))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -135,9 +197,10 @@ def reset_password(
             detail="Password cannot exceed 72 bytes"
         )
 
-    user.hashed_password = hash_password(payload.new_password)
+    user.hashed_password = await hash_password_async(payload.new_password)
     db.add(user)
-    db.commit()
+    await db.commit()
+    await invalidate_cached_user(user.id)
 
     return {"msg": "Password updated successfully"}
 
@@ -145,40 +208,56 @@ def reset_password(
 #placeholder account deletion, no email confirmation needed like signup
 #will be updated in future together along with signup to include email confirmation flows
 @router.delete("/me", status_code=status.HTTP_200_OK)
-def delete_me(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def delete_me(
+    current_user: CachedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
-        db.delete(current_user)
-        db.commit()
+        # get_current_user may be served from the cache, so load the ORM row here
+        user = await db.get(User, current_user.id)
+        if user is not None:
+            # awaited so the cascade to the user's runs can load them asynchronously
+            await db.delete(user)
+            await db.commit()
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"Error during user deletion: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete account"
         )
+    await invalidate_cached_user(current_user.id)
     return {"detail": "Account deleted successfully"}
 
 
-@router.post("/generate-upload-url", status_code=status.HTTP_200_OK)
-def create_upload_url(current_user: User = Depends(get_current_user)):
-    bucket_name = "user_videos_test"
-    unique_filename = f"{current_user.id}/{uuid.uuid4()}.mp4"
+def _new_video_path(user_id: int) -> str:
+    return f"{user_id}/{uuid.uuid4()}.mp4"
 
+
+@router.post("/generate-upload-url", response_model=UploadUrlOut, status_code=status.HTTP_200_OK)
+async def create_upload_url(current_user: CachedUser = Depends(get_current_user)):
     try:
-        signed_url_response = supabase_client.storage.from_(bucket_name).create_signed_upload_url(
-            path=unique_filename
-        )
-        #print("DEBUG: Supabase response:", signed_url_response)
-        return {
-            "upload_url": signed_url_response['signed_url'],
-            "path": signed_url_response['path']
-        }
+        return await get_upload_storage().create_signed_upload_url(_new_video_path(current_user.id))
 
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create upload URL: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/generate-upload-urls", response_model=UploadUrlBatchOut, status_code=status.HTTP_200_OK)
+async def create_upload_urls(
+    payload: UploadUrlBatchIn,
+    current_user: CachedUser = Depends(get_current_user)
+):
+    """Signed upload URLs for several clips in one round trip."""
+    paths = [_new_video_path(current_user.id) for _ in range(payload.count)]
+    try:
+        return UploadUrlBatchOut(uploads=await create_signed_upload_urls(paths))
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create upload URLs: {str(e)}"
+        )
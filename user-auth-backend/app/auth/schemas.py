@@ -1,5 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime  # <-- Added import here to define the type
+from app.core.config import settings
 
 
 class SignUpIn(BaseModel):
@@ -35,4 +36,14 @@ class PasswordResetRequestIn(BaseModel):
 
 class PasswordResetIn(BaseModel):
     token: str
-    new_password: str
\ No newline at end of file
+    new_password: str
+
+class UploadUrlOut(BaseModel):
+    upload_url: str
+    path: str
+
+class UploadUrlBatchIn(BaseModel):
+    count: int = Field(..., ge=1, le=settings.MAX_UPLOAD_URLS_PER_REQUEST)
+
+class UploadUrlBatchOut(BaseModel):
+    uploads: list[UploadUrlOut]
\ No newline at end of file
@@ -8,7 +8,23 @@ load_dotenv()
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
+    # Optional explicit async URL; derived from DATABASE_URL (asyncpg) when unset
+    ASYNC_DATABASE_URL: str | None = None
+    # Optional read replica (sync URL form; the async driver is derived)
+    DATABASE_REPLICA_URL: str | None = None
+    # Reads of a user's listings stay on the primary this long after they write
+    REPLICA_STICKY_SECONDS: int = 10
+
+    # Per engine and per process: a gunicorn worker can open up to
+    # (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections per engine
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE_SECONDS: int = -1  # -1: never recycle
+    DB_POOL_TIMEOUT_SECONDS: float = 30
     
+    # Redis (RQ queue, progress, cache invalidation); connected on first use
+    REDIS_URL: str | None = None
+
     # JWT Configuration
     JWT_SECRET: str
     JWT_ALG: str = "HS256"
@@ -16,9 +32,117 @@ class Settings(BaseSettings):
 
     PASSWORD_RESET_TOKEN_EXPIRE_MINUTES: int = 15
     SECRET_KEY: str = "secretkey"
+
+    # Password hashing executor (defaults to one thread per core)
+    HASH_WORKERS: int | None = None
+    HASH_MAX_QUEUE: int = 64
+    HASH_RETRY_AFTER_SECONDS: int = 2
+
+    # bcrypt cost for new hashes; logins re-hash passwords stored with another
+    # cost. With BCRYPT_TARGET_MS set (and BCRYPT_ROUNDS not), render-start.sh
+    # calibrates the cost to that hash time on the current machine.
+    BCRYPT_ROUNDS: int = 12
+    BCRYPT_TARGET_MS: float | None = None
+    BCRYPT_MIN_ROUNDS: int = 10
+
+    # Authenticated-user cache (a TTL of 0 disables it)
+    USER_CACHE_TTL_SECONDS: float = 30
+    USER_CACHE_MAX_SIZE: int = 10000
+    # Redis pub/sub channel used to spread invalidations across workers
+    USER_CACHE_INVALIDATION_CHANNEL: str | None = None
+
+    # Verified access-token cache; entries expire with the token's own exp
+    TOKEN_CACHE_ENABLED: bool = True
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+
+    # Sliding-window limits on the anonymous auth endpoints, per window
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_WINDOW_SECONDS: int = 60
+    RATE_LIMIT_LOGIN_PER_IP: int = 30
+    RATE_LIMIT_LOGIN_PER_EMAIL: int = 10
+    RATE_LIMIT_SIGNUP_PER_IP: int = 10
+    RATE_LIMIT_PASSWORD_RESET_PER_IP: int = 10
+    RATE_LIMIT_PASSWORD_RESET_PER_EMAIL: int = 3
+    # Only behind a proxy that appends the client address (Render does)
+    RATE_LIMIT_TRUST_FORWARDED_FOR: bool = False
+
+    # Video storage ("supabase" or "local") and analysis pipeline
+    SUPABASE_URL: str | None = None
+    SUPABASE_SERVICE_KEY: str | None = None
+    VIDEO_STORAGE_BACKEND: str = "supabase"
+    VIDEO_STORAGE_LOCAL_ROOT: str = "./videos"
+    VIDEO_BUCKET: str = "user_videos_test"
+    # Keep-alive connections to the storage API per process
+    STORAGE_MAX_CONNECTIONS: int = 20
+    MAX_UPLOAD_URLS_PER_REQUEST: int = 20
+    VIDEO_READ_CHUNK_BYTES: int = 1024 * 1024
+    VIDEO_SAMPLE_FPS: float = 10
+    VIDEO_PIPELINE_QUEUE_SIZE: int = 8
+    VIDEO_INFERENCE_BATCH_SIZE: int = 8
+    # Videos longer than one segment are split across this many processes
+    # (defaults to one per core; 1 keeps analysis in a single pass)
+    VIDEO_ANALYSIS_WORKERS: int | None = None
+    VIDEO_SEGMENT_SECONDS: float = 300
+    # Bump when the pose model changes so old results are not reused
+    POSE_MODEL_VERSION: str = "placeholder-1"
+    # Hash uploads and reuse results of an identical, already analyzed video
+    VIDEO_DEDUP_ENABLED: bool = True
+
+    # RQ worker: "fork" preloads heavy state then forks a work horse per job
+    # (copy-on-write); "simple" runs every job in the one long-lived process.
+    WORKER_MODE: str = "fork"
+    # "module:function" callables run once at worker startup, before any fork
+    WORKER_STARTUP_HOOKS: list[str] = ["app.tasks.warmup:load_pipeline"]
+
+    # Run-analysis outbox dispatcher (dispatcher.py)
+    OUTBOX_BATCH_SIZE: int = 500
+    OUTBOX_POLL_SECONDS: float = 0.5
+    OUTBOX_RETENTION_HOURS: int = 24
+    # RQ kills a job after this long (its own default is 180 s); leave room
+    # for the longest video a worker is expected to analyze
+    ANALYSIS_JOB_TIMEOUT_SECONDS: int = 3 * 3600
+
+    # Run-analysis progress kept in Redis for /runs/{id}/status and /events
+    PROGRESS_TTL_SECONDS: int = 86400
+    PROGRESS_HEARTBEAT_SECONDS: float = 15
+
+    # Encode run/user responses from trusted DB data without re-validation,
+    # passing JSONB through as text (app/core/responses.py)
+    FAST_RESPONSES_ENABLED: bool = False
+    # brotli/gzip for responses of at least this many bytes; 0 disables
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+
+    # Runs per server-side cursor fetch in GET /runs/export
+    RUNS_EXPORT_BATCH_SIZE: int = 200
+
+    # Prometheus metrics: GET /metrics on the API; the worker serves its own
+    # on WORKER_METRICS_PORT when set
+    METRICS_ENABLED: bool = True
+    WORKER_METRICS_PORT: int | None = None
     
+    # Bulk user import (app/services/user_import.py, POST /admin/users/import)
+    ADMIN_API_KEY: str | None = None  # admin endpoints are disabled until set
+    IMPORT_HASH_WORKERS: int | None = None  # bcrypt processes for the CLI, default one per core
+    # The endpoint runs inside an API worker, next to every other gunicorn
+    # worker on the host, so it hashes with a small pool, one import at a time
+    IMPORT_ENDPOINT_HASH_WORKERS: int = 2
+    IMPORT_ENDPOINT_MAX_CONCURRENT: int = 1  # per API worker; more get 409
+    IMPORT_BATCH_SIZE: int = 1000
+    IMPORT_MAX_REPORTED_ERRORS: int = 1000
+
+    # Background dependency probes behind /health/ready and /health/db
+    HEALTH_PROBE_INTERVAL_SECONDS: float = 5
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 2
+    # Failing (or not probed) this long marks a dependency unhealthy
+    HEALTH_UNHEALTHY_AFTER_SECONDS: float = 15
+    # Dependencies that must be healthy for /health/ready; "storage" is probed
+    # and reported too, but an outage there does not take the API out
+    HEALTH_READY_DEPENDENCIES: list[str] = ["postgres", "redis"]
+
     # App Configuration
     APP_ENV: str = "development"
+    # Alembic owns the schema; only local setups without migrations want this
+    CREATE_TABLES_ON_STARTUP: bool = False
     DEBUG: bool = False
     
     class Config:
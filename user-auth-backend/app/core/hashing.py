@@ -0,0 +1,75 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class HashingBusyError(Exception):
+    """Raised when the password hashing queue is full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Password hashing queue is full")
+        self.retry_after = retry_after
+
+
+class BoundedHashingExecutor:
+    """
+    Thread pool for bcrypt with a bounded backlog.
+
+    bcrypt releases the GIL while hashing, so a thread per core gives real
+    parallelism without the request threadpool being tied up. At most
+    ``max_workers + max_queue`` calls are admitted at once; anything beyond
+    that is rejected immediately instead of queueing behind a burst.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, retry_after: int):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._retry_after = retry_after
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusyError(self._retry_after)
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # Release on the executor future rather than the awaiting coroutine, so
+        # a cancelled request does not free the slot while bcrypt is still running.
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_executor: BoundedHashingExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_hashing_executor() -> BoundedHashingExecutor:
+    """Return the per-process hashing executor, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = BoundedHashingExecutor(
+                    max_workers=settings.HASH_WORKERS or os.cpu_count() or 1,
+                    max_queue=settings.HASH_MAX_QUEUE,
+                    retry_after=settings.HASH_RETRY_AFTER_SECONDS,
+                )
+    return _executor
+
+
+def shutdown_hashing_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
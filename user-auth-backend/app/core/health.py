@@ -0,0 +1,125 @@
+"""
+Dependency health, probed in the background.
+
+Each API worker checks Postgres, Redis and the storage backend every
+HEALTH_PROBE_INTERVAL_SECONDS and keeps the outcome in memory, so the
+health endpoints cost no connection and no I/O however often the load
+balancer calls them. A dependency counts as unhealthy once it has not had
+a successful probe for HEALTH_UNHEALTHY_AFTER_SECONDS, whether its probes
+fail or the prober itself has stalled.
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from sqlalchemy import text
+
+from app.core.config import settings
+
+
+@dataclass
+class ProbeStatus:
+    ok: bool = False
+    latency_ms: float | None = None
+    error: str | None = None
+    # time.monotonic() of the last probe and of the last successful one
+    checked_at: float | None = None
+    last_ok_at: float | None = None
+
+
+async def probe_postgres() -> None:
+    from app.db.session import async_engine
+
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def probe_redis() -> None:
+    from app.core.progress import get_async_redis
+
+    await get_async_redis().ping()
+
+
+async def probe_storage() -> None:
+    from app.services.upload_storage import get_upload_storage
+
+    await get_upload_storage().ping()
+
+
+class HealthProber:
+    def __init__(self, probes: dict[str, Callable[[], Awaitable[None]]]):
+        self._probes = probes
+        self.statuses = {name: ProbeStatus() for name in probes}
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.gather(*(self._probe(name, probe) for name, probe in self._probes.items()))
+            await asyncio.sleep(settings.HEALTH_PROBE_INTERVAL_SECONDS)
+
+    async def _probe(self, name: str, probe: Callable[[], Awaitable[None]]) -> None:
+        status = self.statuses[name]
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(probe(), timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS)
+        except Exception as e:
+            if status.ok or status.checked_at is None:
+                # Log transitions only, not every failed probe
+                print(f"Health probe {name} failed: {e!r}")
+            status.ok = False
+            status.error = repr(e) if str(e) else type(e).__name__
+        else:
+            if not status.ok and status.checked_at is not None:
+                print(f"Health probe {name} recovered")
+            status.ok = True
+            status.error = None
+            status.last_ok_at = time.monotonic()
+        status.checked_at = time.monotonic()
+        status.latency_ms = round((status.checked_at - started) * 1000, 2)
+
+    def healthy(self, name: str, now: float) -> bool:
+        status = self.statuses[name]
+        return (
+            status.last_ok_at is not None
+            and now - status.last_ok_at <= settings.HEALTH_UNHEALTHY_AFTER_SECONDS
+        )
+
+    def report(self) -> tuple[bool, dict]:
+        """(ready, per-dependency details) from the cached probe results."""
+        now = time.monotonic()
+        dependencies = {}
+        for name, status in self.statuses.items():
+            dependencies[name] = {
+                "healthy": self.healthy(name, now),
+                "ok": status.ok,
+                "latency_ms": status.latency_ms,
+                "checked_seconds_ago": None if status.checked_at is None else round(now - status.checked_at, 1),
+                "error": status.error,
+                "required": name in settings.HEALTH_READY_DEPENDENCIES,
+            }
+        ready = all(
+            dependencies[name]["healthy"]
+            for name in settings.HEALTH_READY_DEPENDENCIES
+            if name in dependencies
+        )
+        return ready, dependencies
+
+
+def _default_probes() -> dict[str, Callable[[], Awaitable[None]]]:
+    probes = {"postgres": probe_postgres, "storage": probe_storage}
+    if settings.REDIS_URL:
+        probes["redis"] = probe_redis
+    return probes
+
+
+health_prober = HealthProber(_default_probes())
@@ -0,0 +1,200 @@
+"""
+Prometheus metrics for the API and the RQ worker.
+
+gunicorn runs several API processes, so the values are kept in
+prometheus_client's multiprocess mode whenever PROMETHEUS_MULTIPROC_DIR is
+set (render-start.sh does that): every process writes its samples to
+memory-mapped files in that directory and a scrape of any one worker sums
+them all. gunicorn.conf.py cleans up after exited workers. Without the
+variable (uvicorn --reload, benchmarks) the default in-process registry is
+used.
+"""
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of its response.",
+    ["method", "route", "status"],
+)
+
+# livesum: the pool is per process, the total is what the database sees
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the SQLAlchemy pool.",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "Connections open beyond pool_size.",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "bcrypt time per call, excluding the wait for a hashing thread.",
+    ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0),
+)
+
+RQ_JOB_DURATION = Histogram(
+    "rq_job_duration_seconds",
+    "Wall time of an RQ job, including forking the work horse.",
+    ["queue", "function", "outcome"],
+    buckets=(0.1, 0.5, 1, 5, 15, 30, 60, 120, 300, 600, 1200, 3600),
+)
+
+
+def instrument_pool(engine, name: str) -> None:
+    """Keep the pool gauges of a sync Engine (or AsyncEngine.sync_engine) current."""
+    from sqlalchemy import event
+
+    checked_out = DB_POOL_CHECKED_OUT.labels(name)
+    overflow = DB_POOL_OVERFLOW.labels(name)
+
+    def update(*_):
+        # engine.pool rather than a captured pool: dispose() replaces it
+        pool = engine.pool
+        if hasattr(pool, "checkedout"):
+            checked_out.set(pool.checkedout())
+            # overflow() starts at -pool_size and counts up
+            overflow.set(max(0, pool.overflow()))
+
+    event.listen(engine, "checkout", update)
+    event.listen(engine, "checkin", update)
+
+
+class RQQueueCollector:
+    """Reports queue depths at scrape time; Redis is the source of truth."""
+
+    def __init__(self, queue_names: list[str]):
+        self._queue_names = queue_names
+
+    def collect(self):
+        from rq import Queue
+
+        from app.core.queue import get_redis_conn
+
+        depth = GaugeMetricFamily("rq_queue_depth", "Jobs waiting in an RQ queue.", labels=["queue"])
+        try:
+            conn = get_redis_conn()
+            for name in self._queue_names:
+                depth.add_metric([name], Queue(name, connection=conn).count)
+        except Exception as e:
+            # A scrape must not fail because Redis does; the series just gaps
+            print(f"Failed to read RQ queue depth: {e}")
+            return
+        yield depth
+
+
+class DedupStatsCollector:
+    """
+    Video dedup lookups by outcome, read from the Redis hash every worker
+    adds to (app/tasks/dedup.py), so the hit rate covers all of them.
+    """
+
+    def collect(self):
+        from app.core.queue import get_redis_conn
+        from app.tasks.dedup import DEDUP_STATS_KEY, dedup_stats_from
+
+        try:
+            stats = dedup_stats_from(get_redis_conn().hgetall(DEDUP_STATS_KEY))
+        except Exception as e:
+            print(f"Failed to read dedup stats: {e}")
+            return
+        lookups = CounterMetricFamily(
+            "run_dedup_lookups", "Dedup lookups before video analysis, by outcome.", labels=["outcome"]
+        )
+        lookups.add_metric(["hit"], stats["hits"])
+        lookups.add_metric(["miss"], stats["misses"])
+        yield lookups
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+class _DefaultRegistryProxy:
+    """Exposes the default registry's metrics through another registry."""
+
+    def collect(self):
+        return REGISTRY.collect()
+
+
+def build_registry(queue_names: list[str] | None = None, dedup_stats: bool = False) -> CollectorRegistry:
+    """
+    Registry for one scrape: all processes' samples in multiprocess mode,
+    plus queue depth if ``queue_names`` is given and the dedup counters if
+    ``dedup_stats``.
+    """
+    registry = CollectorRegistry()
+    if multiprocess_enabled():
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry.register(_DefaultRegistryProxy())
+    if queue_names:
+        registry.register(RQQueueCollector(queue_names))
+    if dedup_stats:
+        registry.register(DedupStatsCollector())
+    return registry
+
+
+def render_metrics(queue_names: list[str] | None = None, dedup_stats: bool = False) -> tuple[bytes, str]:
+    """Body and content type of a /metrics response."""
+    return generate_latest(build_registry(queue_names, dedup_stats)), CONTENT_TYPE_LATEST
+
+
+def start_metrics_server(port: int, queue_names: list[str] | None = None) -> None:
+    """Serve /metrics from a background thread, for processes without an HTTP app."""
+    start_http_server(port, registry=build_registry(queue_names))
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording HTTP_REQUEST_DURATION.
+
+    The route label is the path template (``/runs/{run_id}``), not the raw
+    path, so the number of series stays bounded. Requests that match no route
+    are counted under ``unmatched``.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.labels(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status_code),
+            ).observe(time.perf_counter() - started)
@@ -0,0 +1,161 @@
+"""
+Run-analysis progress in Redis.
+
+The worker keeps the latest state of each run under ``run-progress:{id}``
+(read by GET /runs/{id}/status) and publishes every change on
+``run-progress-events:{id}`` (streamed by GET /runs/{id}/events). The stored
+state includes the owner's user id, so the API can authorize a status read
+without touching Postgres.
+"""
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from app.core.config import settings
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+TERMINAL_STATES = {COMPLETED, FAILED}
+
+_CHANNEL_PREFIX = "run-progress-events:"
+
+
+def progress_key(run_id: int) -> str:
+    return f"run-progress:{run_id}"
+
+
+def progress_channel(run_id: int) -> str:
+    return f"{_CHANNEL_PREFIX}{run_id}"
+
+
+def publish_progress(
+        conn,
+        run_id: int,
+        user_id: int,
+        state: str,
+        stage: str | None = None,
+        percent: float | None = None
+) -> None:
+    """
+    Store and publish one progress update. ``conn`` is a sync Redis client
+    or pipeline; with a pipeline the caller executes it.
+    """
+    payload = json.dumps({
+        "run_id": run_id,
+        "user_id": user_id,
+        "state": state,
+        "stage": stage,
+        "percent": None if percent is None else round(percent, 1),
+        "updated_at": time.time(),
+    })
+    conn.set(progress_key(run_id), payload, ex=settings.PROGRESS_TTL_SECONDS)
+    conn.publish(progress_channel(run_id), payload)
+
+
+class ProgressReporter:
+    """Worker-side helper that rate-limits percent updates for one run."""
+
+    def __init__(self, conn, run_id: int, user_id: int, min_interval: float = 1.0):
+        self._conn = conn
+        self._run_id = run_id
+        self._user_id = user_id
+        self._min_interval = min_interval
+        self._last_sent = 0.0
+
+    def update(self, state: str, stage: str | None = None, percent: float | None = None, force: bool = True) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_sent < self._min_interval:
+            return
+        self._last_sent = now
+        try:
+            publish_progress(self._conn, self._run_id, self._user_id, state, stage, percent)
+        except Exception as e:
+            # Progress is best effort; never fail the analysis over it
+            print(f"Failed to publish progress for run {self._run_id}: {e}")
+
+
+_async_redis = None
+
+
+def get_async_redis():
+    """Process-wide asyncio Redis client for the API side."""
+    global _async_redis
+    if _async_redis is None:
+        import redis.asyncio
+        if not settings.REDIS_URL:
+            raise ValueError("REDIS_URL must be set in environment variables.")
+        _async_redis = redis.asyncio.from_url(settings.REDIS_URL)
+    return _async_redis
+
+
+async def read_progress(run_id: int) -> dict | None:
+    raw = await get_async_redis().get(progress_key(run_id))
+    return json.loads(raw) if raw else None
+
+
+class ProgressBroker:
+    """
+    Fans progress messages out to the SSE streams of one API worker.
+
+    A single pattern subscription serves every open stream, so thousands of
+    waiting clients cost one Redis connection per worker, not one each.
+    """
+
+    def __init__(self):
+        self._subscribers: dict[int, set[asyncio.Queue]] = {}
+        self._task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def subscribe(self, run_id: int) -> AsyncIterator[asyncio.Queue]:
+        await self._ensure_listening()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=16)
+        self._subscribers.setdefault(run_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(run_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[run_id]
+
+    async def _ensure_listening(self) -> None:
+        async with self._lock:
+            if self._task is None or self._task.done():
+                pubsub = get_async_redis().pubsub(ignore_subscribe_messages=True)
+                await pubsub.psubscribe(f"{_CHANNEL_PREFIX}*")
+                self._task = asyncio.create_task(self._listen(pubsub))
+
+    async def _listen(self, pubsub) -> None:
+        try:
+            async for message in pubsub.listen():
+                if message["type"] != "pmessage":
+                    continue
+                try:
+                    run_id = int(message["channel"].rsplit(b":", 1)[1])
+                except (TypeError, ValueError):
+                    continue
+                for queue in self._subscribers.get(run_id, ()):
+                    if queue.full():
+                        # Slow client: only the latest state matters
+                        queue.get_nowait()
+                    queue.put_nowait(json.loads(message["data"]))
+        except Exception as e:
+            # Streams fall back to re-reading the stored state on their
+            # heartbeat; the next subscribe() starts a fresh listener.
+            print(f"Progress listener stopped: {e}")
+        finally:
+            await pubsub.aclose()
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+progress_broker = ProgressBroker()
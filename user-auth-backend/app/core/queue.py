@@ -1,18 +1,31 @@
-import os
-import redis
-from rq import Queue
-from dotenv import load_dotenv
+from app.core.config import settings
 
-load_dotenv()
+# Created on first use, so importing the app neither needs Redis configured
+# nor pays for the redis/rq imports until something actually enqueues.
+_redis_conn = None
+_queue = None
 
-# Get Redis URL from environment variables
-REDIS_URL = os.environ.get("REDIS_URL")
-if not REDIS_URL:
-    raise ValueError("REDIS_URL must be set in environment variables.")
 
-# Establish a connection to Redis
-redis_conn = redis.from_url(REDIS_URL)
+def get_redis_conn():
+    """Process-wide Redis connection (redis.Redis)."""
+    global _redis_conn
+    if _redis_conn is None:
+        import redis
 
-# Create a queue instance that uses this connection
-# The name 'default' is the queue it will listen to.
-queue = Queue("default", connection=redis_conn)
\ No newline at end of file
+        if not settings.REDIS_URL:
+            raise ValueError("REDIS_URL must be set in environment variables.")
+        _redis_conn = redis.from_url(settings.REDIS_URL)
+    return _redis_conn
+
+
+def get_queue():
+    """
+    The RQ queue analysis jobs go to (rq.Queue).
+    The name 'default' is the queue the worker listens to.
+    """
+    global _queue
+    if _queue is None:
+        from rq import Queue
+
+        _queue = Queue("default", connection=get_redis_conn())
+    return _queue
@@ -0,0 +1,172 @@
+"""
+Sliding-window rate limits for the anonymous auth endpoints.
+
+Each limit keeps one counter per fixed window and estimates the sliding
+window as ``current + previous * (share of the previous window still
+inside it)``, which costs two small keys per client instead of a log of
+timestamps. The check-and-increment runs as one Lua script, so concurrent
+requests on different API workers cannot both take the last slot.
+
+If Redis is unreachable the same algorithm runs in process memory: limits
+then apply per worker rather than globally, which is looser but still caps
+what a single client can make us hash.
+"""
+import math
+import time
+from dataclasses import dataclass
+
+from fastapi import HTTPException, Request, status
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.progress import get_async_redis
+
+# KEYS[1]: counter prefix. ARGV: limit, window in ms.
+# Returns {allowed (0/1), retry after in ms}.
+_SLIDING_WINDOW_LUA = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local index = math.floor(now / window)
+local elapsed = now - index * window
+local current_key = KEYS[1] .. ':' .. index
+local current = tonumber(redis.call('GET', current_key) or '0')
+local previous = tonumber(redis.call('GET', KEYS[1] .. ':' .. (index - 1)) or '0')
+local weight = (window - elapsed) / window
+if current + previous * weight + 1 > limit then
+    local retry = window - elapsed
+    if current + 1 <= limit then
+        retry = math.ceil((window - elapsed) - (limit - 1 - current) * window / previous)
+    end
+    return {0, retry}
+end
+redis.call('INCR', current_key)
+redis.call('PEXPIRE', current_key, window * 2)
+return {1, 0}
+"""
+
+# After a Redis error, stay on the in-memory limiter this long before retrying
+_REDIS_RETRY_SECONDS = 5.0
+
+
+@dataclass(frozen=True)
+class Limit:
+    """``requests`` per ``window`` seconds for one kind of key (IP or email)."""
+
+    scope: str
+    requests: int
+    window: int
+
+
+class SlidingWindowLimiter:
+    def __init__(self, prefix: str = "rate-limit", memory_max_keys: int = 100_000):
+        self._prefix = prefix
+        self._script = None
+        self._redis_down_until = 0.0
+        self._memory: TTLCache[str, int] = TTLCache(maxsize=memory_max_keys)
+
+    async def hit(self, limit: Limit, identity: str) -> float:
+        """
+        Count one request for ``identity`` against ``limit``.
+        Returns 0 if allowed, otherwise the seconds to wait before retrying.
+        """
+        # Hash tag keeps both window keys of one identity on the same cluster slot
+        key = f"{self._prefix}:{limit.scope}:{{{identity}}}"
+        if time.monotonic() >= self._redis_down_until:
+            try:
+                return await self._hit_redis(key, limit)
+            except Exception as e:
+                print(f"Rate limiter falling back to memory: {e}")
+                self._redis_down_until = time.monotonic() + _REDIS_RETRY_SECONDS
+        return self._hit_memory(key, limit)
+
+    async def _hit_redis(self, key: str, limit: Limit) -> float:
+        if self._script is None:
+            self._script = get_async_redis().register_script(_SLIDING_WINDOW_LUA)
+        allowed, retry_ms = await self._script(keys=[key], args=[limit.requests, limit.window * 1000])
+        return 0.0 if allowed else int(retry_ms) / 1000
+
+    def _hit_memory(self, key: str, limit: Limit) -> float:
+        now = time.time()
+        index, offset = divmod(now, limit.window)
+        index = int(index)
+        current_key = f"{key}:{index}"
+        current = self._memory.get(current_key) or 0
+        previous = self._memory.get(f"{key}:{index - 1}") or 0
+        remaining = limit.window - offset
+        if current + previous * remaining / limit.window + 1 > limit.requests:
+            if current + 1 <= limit.requests:
+                return remaining - (limit.requests - 1 - current) * limit.window / previous
+            return remaining
+        self._memory.set(current_key, current + 1, expires_at=(index + 2) * limit.window)
+        return 0.0
+
+
+limiter = SlidingWindowLimiter()
+
+
+def client_ip(request: Request) -> str:
+    if settings.RATE_LIMIT_TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            # The proxy appends the address it saw; earlier entries are client-supplied
+            return forwarded.rsplit(",", 1)[-1].strip()
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimit:
+    """
+    Dependency enforcing per-IP and, optionally, per-email limits.
+
+    Use it in the route decorator's ``dependencies`` so it runs before the
+    database session dependency and before any hashing::
+
+        @router.post("/login", dependencies=[Depends(RateLimit("login", per_ip=..., per_email=...))])
+
+    The email is read from the JSON body's ``email_field``; Starlette caches
+    the body, so the endpoint's own parsing does not read it twice.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            per_ip: int | None = None,
+            per_email: int | None = None,
+            window: int | None = None,
+            email_field: str = "email"
+    ):
+        window = window or settings.RATE_LIMIT_WINDOW_SECONDS
+        self.ip_limit = Limit(f"{name}:ip", per_ip, window) if per_ip else None
+        self.email_limit = Limit(f"{name}:email", per_email, window) if per_email else None
+        self.email_field = email_field
+
+    async def __call__(self, request: Request) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+
+        if self.ip_limit is not None:
+            _raise_if_limited(await limiter.hit(self.ip_limit, client_ip(request)))
+
+        if self.email_limit is not None:
+            email = await _body_field(request, self.email_field)
+            if isinstance(email, str) and email:
+                _raise_if_limited(await limiter.hit(self.email_limit, email.strip().lower()))
+
+
+async def _body_field(request: Request, field: str):
+    try:
+        body = await request.json()
+    except ValueError:
+        # Malformed JSON: let the endpoint's validation reject it
+        return None
+    return body.get(field) if isinstance(body, dict) else None
+
+
+def _raise_if_limited(retry_after: float) -> None:
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests, please retry later",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
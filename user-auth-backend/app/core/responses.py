@@ -0,0 +1,157 @@
+"""
+Fast JSON responses and response compression.
+
+With FAST_RESPONSES_ENABLED, routes return pre-encoded bytes instead of a
+model for FastAPI to validate and encode: the data was just read from our
+own database, so it is wrapped with ``model_construct`` (no validation) and
+encoded by a prebuilt TypeAdapter, which gives the same JSON as the
+response_model path. Large JSONB documents skip Python entirely: they are
+selected as text and spliced into the body as is.
+"""
+import zlib
+
+import brotli
+import orjson
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter
+from starlette.datastructures import Headers, MutableHeaders
+
+
+class RawJSONResponse(Response):
+    """A response whose body is already encoded JSON."""
+
+    media_type = "application/json"
+
+
+def dump_model(adapter: TypeAdapter, model: type[BaseModel], **fields) -> bytes:
+    """Encode trusted ``fields`` as ``model`` without validating them."""
+    return adapter.dump_json(model.model_construct(**fields))
+
+
+def splice_json(head: bytes, key: str, raw_value: str | bytes | None) -> bytes:
+    """
+    Add ``key`` with an already encoded JSON value to an encoded object,
+    e.g. the text of a JSONB column. None becomes null.
+    """
+    if raw_value is None:
+        raw_value = b"null"
+    elif isinstance(raw_value, str):
+        raw_value = raw_value.encode()
+    separator = b"," if head != b"{}" else b""
+    return b"".join((head[:-1], separator, orjson.dumps(key), b":", raw_value, b"}"))
+
+
+def dumps(value) -> bytes:
+    """Encode plain data (dicts, lists, datetimes) with orjson."""
+    return orjson.dumps(value, option=orjson.OPT_UTC_Z)
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        # Sync flush: each streamed chunk can be decoded as soon as it arrives
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class _BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+def _accepted_encoding(accept_encoding: str) -> str | None:
+    offered = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        offered[name.strip()] = q
+    for encoding in ("br", "gzip"):
+        if offered.get(encoding, 0) > 0:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses of at least ``minimum_size`` bytes with brotli or
+    gzip, whichever the client prefers in that order. Streaming responses
+    are compressed chunk by chunk; server-sent events and responses that
+    already carry a Content-Encoding are passed through.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = _accepted_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        encoder = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, encoder, passthrough
+            if passthrough or message["type"] not in ("http.response.start", "http.response.body"):
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk shows whether to compress
+                start_message = message
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                if (
+                        "content-encoding" in headers
+                        or headers.get("content-type", "").startswith("text/event-stream")
+                        or (not more_body and len(body) < self.minimum_size)
+                ):
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                encoder = (
+                    _BrotliEncoder(self.brotli_quality) if encoding == "br" else _GzipEncoder(self.gzip_level)
+                )
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    body = encoder.finish(body)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(start_message)
+
+            body = encoder.chunk(body) if more_body else encoder.finish(body)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
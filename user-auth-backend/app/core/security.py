@@ -1,7 +1,16 @@
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
 from jose import jwt, JWTError
 import bcrypt
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.hashing import get_hashing_executor
+from app.core.metrics import PASSWORD_HASH_DURATION
+
+# sha256(token) -> sub for access tokens that already passed verification.
+# Each entry expires at the token's own exp claim.
+token_cache: TTLCache[bytes, str] = TTLCache(maxsize=settings.TOKEN_CACHE_MAX_SIZE)
 
 def hash_password(password: str) -> str:
     """
@@ -21,10 +30,11 @@ def hash_password(password: str) -> str:
         raise ValueError("Password cannot exceed 72 bytes")
     
     # Hash the password and decode the bytes result to a string for storage
-    return bcrypt.hashpw(
-        password.encode('utf-8'), 
-        bcrypt.gensalt(rounds=12)
-    ).decode('utf-8')
+    with PASSWORD_HASH_DURATION.labels("hash").time():
+        return bcrypt.hashpw(
+            password.encode('utf-8'), 
+            bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
+        ).decode('utf-8')
 
 
 def verify_password(plain: str, hashed: str) -> bool:
@@ -44,10 +54,11 @@ def verify_password(plain: str, hashed: str) -> bool:
             return False
         
         # Verify the password. bcrypt.checkpw expects bytes for both arguments.
-        return bcrypt.checkpw(
-            plain.encode('utf-8'), 
-            hashed.encode('utf-8')
-        )
+        with PASSWORD_HASH_DURATION.labels("verify").time():
+            return bcrypt.checkpw(
+                plain.encode('utf-8'), 
+                hashed.encode('utf-8')
+            )
     except ValueError:
         # Catch the ValueError that bcrypt 5.0.0 raises if the password is too long
         return False
@@ -56,6 +67,62 @@ def verify_password(plain: str, hashed: str) -> bool:
         return False
 
 
+def bcrypt_cost(hashed: str) -> int | None:
+    """The cost (log2 rounds) stored in a bcrypt hash like ``$2b$12$...``."""
+    parts = hashed.split('$')
+    try:
+        return int(parts[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def password_needs_rehash(hashed: str) -> bool:
+    """True if a stored hash was made with a different cost than BCRYPT_ROUNDS."""
+    return bcrypt_cost(hashed) != settings.BCRYPT_ROUNDS
+
+
+def calibrate_bcrypt_rounds(target_ms: float, min_rounds: int = 10, max_rounds: int = 16) -> int:
+    """
+    Highest cost whose hash time on this machine stays within ``target_ms``,
+    but never below ``min_rounds``. Each extra round doubles the time, so one
+    measurement at ``min_rounds`` is extrapolated (best of three, to skip
+    warm-up noise).
+    """
+    password = b'calibration-password'
+    salt = bcrypt.gensalt(rounds=min_rounds)
+    samples = []
+    for _ in range(3):
+        started = time.perf_counter()
+        bcrypt.hashpw(password, salt)
+        samples.append((time.perf_counter() - started) * 1000)
+    base_ms = min(samples)
+
+    rounds = min_rounds
+    while rounds < max_rounds and base_ms * 2 ** (rounds + 1 - min_rounds) <= target_ms:
+        rounds += 1
+    return rounds
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password on the bounded hashing executor.
+
+    Raises:
+        HashingBusyError: If the hashing queue is full
+    """
+    return await get_hashing_executor().run(hash_password, password)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    """
+    Verify a password on the bounded hashing executor.
+
+    Raises:
+        HashingBusyError: If the hashing queue is full
+    """
+    return await get_hashing_executor().run(verify_password, plain, hashed)
+
+
 def create_access_token(sub: str, expires_delta: timedelta | None = None) -> str:
     """
     Create a JWT access token.
@@ -84,6 +151,9 @@ def create_access_token(sub: str, expires_delta: timedelta | None = None) -> str
 def decode_access_token(token: str) -> str | None:
     """
     Decode and verify a JWT access token.
+
+    Tokens that verified before are answered from ``token_cache`` until
+    their exp, skipping the signature check.
     
     Args:
         token: JWT token string to decode
@@ -91,6 +161,22 @@ def decode_access_token(token: str) -> str | None:
     Returns:
         Subject (user ID) if token is valid, None otherwise
     """
+    if not settings.TOKEN_CACHE_ENABLED:
+        return _verify_access_token(token)[0]
+
+    key = hashlib.sha256(token.encode('utf-8')).digest()
+    sub = token_cache.get(key)
+    if sub is not None:
+        return sub
+
+    sub, exp = _verify_access_token(token)
+    if sub is not None and exp is not None:
+        token_cache.set(key, sub, expires_at=exp)
+    return sub
+
+
+def _verify_access_token(token: str) -> tuple[str | None, float | None]:
+    """Full JWT verification; returns (sub, exp) or (None, None)."""
     try:
         payload = jwt.decode(
             token, 
@@ -101,14 +187,15 @@ def decode_access_token(token: str) -> str | None:
         
         # Ensure sub exists and is a string
         if sub is None or not isinstance(sub, str):
-            return None
-            
-        return sub
+            return None, None
+
+        exp = payload.get("exp")
+        return sub, float(exp) if isinstance(exp, (int, float)) else None
     except JWTError:
-        return None
+        return None, None
     except Exception:
         # Catch any other unexpected errors
-        return None
+        return None, None
 
 def create_password_reset_token(email: str) -> str:
     """
@@ -127,4 +214,10 @@ def decode_password_reset_token(token: str) -> str | None:
         decoded_token = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.JWT_ALG])
         return decoded_token.get("sub")
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+
+
+if __name__ == "__main__":
+    # Prints the cost for BCRYPT_TARGET_MS on this machine; render-start.sh
+    # exports it as BCRYPT_ROUNDS so every worker uses the same value.
+    print(calibrate_bcrypt_rounds(settings.BCRYPT_TARGET_MS or 250, min_rounds=settings.BCRYPT_MIN_ROUNDS))
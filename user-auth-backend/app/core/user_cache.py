@@ -0,0 +1,73 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+
+@dataclass(frozen=True, slots=True)
+class CachedUser:
+    """The user fields authenticated requests need, detached from any session."""
+    id: int
+    email: str
+    is_active: bool
+    created_at: datetime
+
+
+user_cache: TTLCache[int, CachedUser] = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
+_pubsub_thread = None
+
+
+async def invalidate_cached_user(user_id: int) -> None:
+    """
+    Drop a user from this worker's cache and, when a channel is configured,
+    tell the other workers to do the same.
+    """
+    user_cache.invalidate(user_id)
+
+    channel = settings.USER_CACHE_INVALIDATION_CHANNEL
+    if not channel:
+        return
+    try:
+        from app.core.queue import get_redis_conn
+        await run_in_threadpool(get_redis_conn().publish, channel, str(user_id))
+    except Exception as e:
+        # The TTL still bounds staleness on the other workers
+        print(f"Failed to publish user cache invalidation for {user_id}: {e}")
+
+
+def _handle_invalidation(message: dict) -> None:
+    try:
+        user_cache.invalidate(int(message["data"]))
+    except (TypeError, ValueError):
+        pass
+
+
+def start_invalidation_listener() -> None:
+    """Subscribe to the invalidation channel in a background thread, if configured."""
+    global _pubsub_thread
+    channel = settings.USER_CACHE_INVALIDATION_CHANNEL
+    if not channel or _pubsub_thread is not None:
+        return
+
+    try:
+        from app.core.queue import get_redis_conn
+        pubsub = get_redis_conn().pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{channel: _handle_invalidation})
+        _pubsub_thread = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+    except Exception as e:
+        # Keep serving; this worker then relies on the TTL alone
+        print(f"Failed to subscribe to user cache invalidations: {e}")
+
+
+def stop_invalidation_listener() -> None:
+    global _pubsub_thread
+    if _pubsub_thread is not None:
+        _pubsub_thread.stop()
+        _pubsub_thread = None
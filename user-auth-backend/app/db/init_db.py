@@ -1,6 +1,9 @@
 from app.db.base import Base
 from app.db.session import engine
 from app.models.user import User  # Import all models
+from app.models.run import Run
+from app.models.outbox import RunAnalysisOutbox
+from app.models.frame_data import RunFrameData
 
 def init_db():
     """Initialize database tables."""
@@ -0,0 +1,71 @@
+"""
+Read-your-own-writes on top of the read replica.
+
+Replicas trail the primary by a little, so lag-tolerant reads go to
+AsyncReadSessionLocal while reads that must see the caller's own writes
+either:
+
+- retry on the primary when the replica comes back empty (point lookups
+  such as a run created a moment ago), or
+- go to the primary for REPLICA_STICKY_SECONDS after the user wrote
+  (listings, where a missing row cannot be told from lag).
+
+The user lookup behind get_current_user does not use the replica at all:
+its result is cached, and a stale row would keep a deleted or deactivated
+account authenticated for the cache TTL.
+
+Without DATABASE_REPLICA_URL all of this is a no-op.
+"""
+from typing import Awaitable, Callable, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.progress import get_async_redis
+from app.db.session import AsyncSessionLocal, async_replica_engine
+
+T = TypeVar("T")
+
+
+def replica_enabled() -> bool:
+    return async_replica_engine is not None
+
+
+def _sticky_key(user_id: int) -> str:
+    return f"db-recent-write:{user_id}"
+
+
+async def mark_recent_write(user_id: int) -> None:
+    """Send this user's listings to the primary for a while."""
+    if not replica_enabled():
+        return
+    try:
+        await get_async_redis().set(_sticky_key(user_id), 1, ex=settings.REPLICA_STICKY_SECONDS)
+    except Exception as e:
+        print(f"Failed to mark recent write for user {user_id}: {e}")
+
+
+async def wrote_recently(user_id: int) -> bool:
+    if not replica_enabled():
+        return False
+    try:
+        return bool(await get_async_redis().exists(_sticky_key(user_id)))
+    except Exception:
+        # Cannot tell, so stay consistent
+        return True
+
+
+async def first_row(db: AsyncSession, stmt):
+    return (await db.execute(stmt)).first()
+
+
+async def read_or_primary(read_db: AsyncSession, query: Callable[[AsyncSession], Awaitable[T]]) -> T:
+    """
+    Run ``query`` on ``read_db``; repeat it on the primary only if it found
+    nothing, i.e. the row may not have replicated yet.
+    """
+    result = await query(read_db)
+    if replica_enabled() and result is None:
+        async with AsyncSessionLocal() as db:
+            result = await query(db)
+    return result
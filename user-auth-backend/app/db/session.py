@@ -1,13 +1,24 @@
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.metrics import instrument_pool
+
+
+def _engine_options() -> dict:
+    """Pool settings shared by every engine; see /health/db/pool for sizing."""
+    return {
+        "pool_pre_ping": True,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "echo": settings.DEBUG,  # Log SQL queries in debug mode
+    }
 
-# Add echo=True for debugging in development
-engine = create_engine(
-    settings.DATABASE_URL, 
-    pool_pre_ping=True,
-    echo=settings.DEBUG  # Log SQL queries in debug mode
-)
+
+engine = create_engine(settings.DATABASE_URL, **_engine_options())
 
 SessionLocal = sessionmaker(
     bind=engine, 
@@ -16,6 +27,85 @@ SessionLocal = sessionmaker(
 )
 
 
+def get_async_database_url(url: str) -> URL:
+    """
+    Derive the async driver URL from a sync DATABASE_URL.
+
+    postgresql:// (psycopg2) becomes postgresql+asyncpg://. asyncpg does not
+    understand libpq's ``sslmode`` query parameter, so it is passed on as ``ssl``.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+
+    if backend == "postgresql":
+        query = dict(parsed.query)
+        if "sslmode" in query:
+            query["ssl"] = query.pop("sslmode")
+        return parsed.set(drivername="postgresql+asyncpg", query=query)
+    if backend == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite")
+    return parsed
+
+
+# Async engine used by the request handlers, so a DB round trip awaits on the
+# event loop instead of holding a threadpool slot for its whole duration.
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL),
+    **_engine_options()
+)
+
+# Optional streaming replica for lag-tolerant reads (see app/db/replica.py)
+async_replica_engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_REPLICA_URL),
+    **_engine_options()
+) if settings.DATABASE_REPLICA_URL else None
+
+instrument_pool(engine, "sync")
+instrument_pool(async_engine.sync_engine, "async")
+if async_replica_engine is not None:
+    instrument_pool(async_replica_engine.sync_engine, "replica")
+
+# expire_on_commit=False: attributes must stay readable after commit, since
+# lazy loading is not possible outside an await.
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Same as AsyncSessionLocal when no replica is configured
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_replica_engine or async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+
+def pool_stats() -> dict:
+    """Current usage of each of this process's connection pools."""
+    engines = {"sync": engine, "async": async_engine.sync_engine}
+    if async_replica_engine is not None:
+        engines["replica"] = async_replica_engine.sync_engine
+    stats = {}
+    for name, eng in engines.items():
+        pool = eng.pool
+        if not hasattr(pool, "checkedout"):
+            # e.g. NullPool/StaticPool: nothing to size
+            stats[name] = {"pool": type(pool).__name__}
+            continue
+        stats[name] = {
+            "pool": type(pool).__name__,
+            "size": pool.size(),
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(0, pool.overflow()),
+        }
+    return stats
+
+
 def db_ping() -> bool:
     """Check if database connection is healthy."""
     try:
@@ -23,4 +113,4 @@ def db_ping() -> bool:
             c.execute(text("SELECT 1"))
         return True
     except Exception:
-        return False
\ No newline at end of file
+        return False
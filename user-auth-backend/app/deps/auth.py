@@ -1,20 +1,28 @@
-from fastapi import Depends, HTTPException, status
+import hmac
+from typing import AsyncGenerator
+
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.deps.db import get_db
+from app.core.config import settings
+from app.db.replica import first_row, wrote_recently
+from app.db.session import AsyncReadSessionLocal, AsyncSessionLocal
+from app.deps.db import get_async_db
 from app.models.user import User
 from app.core.security import decode_access_token
+from app.core.user_cache import CachedUser, user_cache
 
 # Initialize the bearer scheme
 # auto_error=False allows us to provide a custom error message
 bearer_scheme = HTTPBearer(auto_error=False)
 
 
-def get_current_user(
+async def get_current_user(
         credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
-        db: Session = Depends(get_db)
-) -> User:
+        db: AsyncSession = Depends(get_async_db)
+) -> CachedUser:
     if not credentials or credentials.scheme.lower() != "bearer":
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -28,12 +36,45 @@ def get_current_user(
             detail="Invalid or expired token"
         )
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    cached = user_cache.get(int(user_id))
+    if cached is not None:
+        return cached
+
+    stmt = select(User.id, User.email, User.is_active, User.created_at).where(User.id == int(user_id))
+    # Always the primary: the result is cached for USER_CACHE_TTL_SECONDS, and
+    # a lagging replica would bring back a user that was just deleted or
+    # deactivated right after invalidate_cached_user dropped them
+    row = await first_row(db, stmt)
 
-    if not user or not user.is_active:
+    if not row or not row.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User inactive or not found"
         )
 
-    return user
\ No newline at end of file
+    user = CachedUser(id=row.id, email=row.email, is_active=row.is_active, created_at=row.created_at)
+    user_cache.set(user.id, user)
+    return user
+
+
+async def get_user_read_db(
+        current_user: CachedUser = Depends(get_current_user)
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Read session for the current user's listings: the replica, unless the
+    user wrote within REPLICA_STICKY_SECONDS and must see that write.
+    """
+    session_factory = AsyncSessionLocal if await wrote_recently(current_user.id) else AsyncReadSessionLocal
+    async with session_factory() as db:
+        yield db
+
+
+async def require_admin(x_admin_key: str | None = Header(default=None)) -> None:
+    """Admin endpoints authenticate with the shared ADMIN_API_KEY, not a user token."""
+    if not settings.ADMIN_API_KEY or not x_admin_key or not hmac.compare_digest(
+            x_admin_key.encode("utf-8"), settings.ADMIN_API_KEY.encode("utf-8")
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin key required"
+        )
@@ -1,6 +1,7 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
+from app.db.session import AsyncReadSessionLocal, AsyncSessionLocal, SessionLocal
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -9,4 +10,19 @@ def get_db() -> Generator[Session, None, None]:
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for getting an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for a session on the read replica (the primary when none is
+    configured). Results can lag recent writes; see app/db/replica.py.
+    """
+    async with AsyncReadSessionLocal() as db:
+        yield db
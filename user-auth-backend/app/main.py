@@ -1,27 +1,43 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, status
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from app.db.session import db_ping
+from fastapi.responses import JSONResponse, Response
+from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.responses import CompressionMiddleware
+from app.core.health import health_prober
+from app.core.hashing import HashingBusyError, shutdown_hashing_executor
+from app.core.progress import get_async_redis, progress_broker
+from app.core.security import token_cache
+from app.core.user_cache import start_invalidation_listener, stop_invalidation_listener, user_cache
+from app.db.session import pool_stats
+from app.services.upload_storage import close_upload_storage
 from app.auth import routes as auth_router
 from app.runs import routes as runs_router
+from app.admin import routes as admin_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
-    from app.db.base import Base
-    from app.db.session import engine
-    from app.models.user import User  # Import models to register them
-
-    # Create tables if they don't exist
-    Base.metadata.create_all(bind=engine)
-    print("✓ Database tables created/verified")
+    # render-start.sh runs `alembic upgrade head` once before the workers
+    # start, so the schema is not re-checked by every worker here.
+    if settings.CREATE_TABLES_ON_STARTUP:
+        from app.db.init_db import init_db
+        init_db()
+    start_invalidation_listener()
+    health_prober.start()
     print("✓ Application started")
     
     yield
     
     # Shutdown
+    await health_prober.stop()
+    stop_invalidation_listener()
+    await progress_broker.close()
+    await close_upload_storage()
+    shutdown_hashing_executor()
     print("✓ Application shutting down")
 
 
@@ -41,18 +57,95 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.COMPRESSION_MINIMUM_SIZE:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
+# Added last so it is outermost and times the whole request, CORS included
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+
+@app.exception_handler(HashingBusyError)
+async def hashing_busy_handler(request: Request, exc: HashingBusyError):
+    """Shed password hashing load fast instead of queueing behind a burst."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 
 @app.get("/health", tags=["health"])
-def health():
+async def health():
     """Basic health check endpoint."""
     return {"status": "ok"}
 
 
+@app.get("/health/live", tags=["health"])
+async def health_live():
+    """Liveness: the process is up and its event loop is serving requests."""
+    return {"status": "ok"}
+
+
+@app.get("/health/ready", tags=["health"])
+async def health_ready():
+    """
+    Readiness from the background prober's cached results; 503 once a
+    required dependency (HEALTH_READY_DEPENDENCIES) has been failing or
+    unprobed for longer than HEALTH_UNHEALTHY_AFTER_SECONDS.
+    """
+    ready, dependencies = health_prober.report()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"status": "ready" if ready else "not ready", "dependencies": dependencies},
+    )
+
+
 @app.get("/health/db", tags=["health"])
-def health_db():
-    """Database health check endpoint."""
-    db_status = "ok" if db_ping() else "down"
-    return {"database": db_status}
+async def health_db():
+    """Database health check endpoint, from the last background probe."""
+    _, dependencies = health_prober.report()
+    return {"database": "ok" if dependencies["postgres"]["healthy"] else "down"}
+
+
+@app.get("/health/db/pool", tags=["health"])
+async def health_db_pool():
+    """
+    Connection pool usage of this worker. Worst case, the deployment opens
+    gunicorn workers x max_connections_per_worker connections (plus the RQ
+    worker and dispatcher), which must stay below Postgres max_connections.
+    """
+    pools = pool_stats()
+    per_engine = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    return {
+        "pools": pools,
+        "max_connections_per_worker": {
+            "primary": per_engine * sum(1 for name in ("sync", "async") if name in pools),
+            "replica": per_engine if "replica" in pools else 0,
+        },
+    }
+
+
+@app.get("/health/cache", tags=["health"])
+async def health_cache():
+    """Authenticated-user and token cache statistics for this worker."""
+    return {"user_cache": user_cache.stats(), "token_cache": token_cache.stats()}
+
+
+@app.get("/health/dedup", tags=["health"])
+async def health_dedup():
+    """Share of analyzed uploads that reused an earlier analysis, across all workers."""
+    from app.tasks.dedup import DEDUP_STATS_KEY, dedup_stats_from
+    return {"video_dedup": dedup_stats_from(await get_async_redis().hgetall(DEDUP_STATS_KEY))}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics, summed over all API worker processes."""
+    if not settings.METRICS_ENABLED:
+        return Response(status_code=status.HTTP_404_NOT_FOUND)
+    body, content_type = render_metrics(queue_names=["default"], dedup_stats=True)
+    return Response(content=body, media_type=content_type)
 
 
 # Include routers
@@ -60,6 +153,8 @@ app.include_router(auth_router.router)
 
 app.include_router(runs_router.router)
 
+app.include_router(admin_router.router)
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the Runalyst API"}
\ No newline at end of file
@@ -0,0 +1,7 @@
+# Importing any model imports them all. Relationships name their targets by
+# string ("User", "Run"), which only resolve once every class is registered,
+# and the worker and dispatcher never import app.main or app.db.init_db.
+from app.models.user import User
+from app.models.run import Run
+from app.models.outbox import RunAnalysisOutbox
+from app.models.frame_data import RunFrameData
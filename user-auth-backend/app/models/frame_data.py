@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey, LargeBinary
+
+from app.db.base import Base
+
+
+class RunFrameData(Base):
+    """
+    Dense per-frame analysis arrays for a run, encoded by app/core/frame_codec.
+
+    Kept out of runs.analysis_results so the runs table (and its TOAST) only
+    holds the small JSON summary.
+    """
+    __tablename__ = 'run_frame_data'
+
+    run_id = Column(Integer, ForeignKey('runs.id', ondelete='CASCADE'), primary_key=True)
+    frames = Column(Integer, nullable=False)
+    fps = Column(Float, nullable=True)
+    data = Column(LargeBinary, nullable=False)
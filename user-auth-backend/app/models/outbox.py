@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index, func, text
+
+from app.db.base import Base
+
+
+class RunAnalysisOutbox(Base):
+    """
+    Analysis jobs waiting to be pushed to RQ.
+
+    A row is inserted in the same transaction as its Run, so a committed run
+    always has one. The dispatcher (dispatcher.py) enqueues pending rows in
+    bulk and stamps dispatched_at.
+    """
+    __tablename__ = 'run_analysis_outbox'
+
+    id = Column(Integer, primary_key=True)
+    run_id = Column(Integer, ForeignKey('runs.id', ondelete='CASCADE'), nullable=False)
+    video_path = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    dispatched_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Only pending rows are ever scanned by the dispatcher
+        Index("ix_run_analysis_outbox_pending", id, postgresql_where=text("dispatched_at IS NULL")),
+    )
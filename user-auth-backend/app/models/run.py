@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index, func
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 
 from app.db.base import Base
 
@@ -15,12 +15,33 @@ class Run(Base):
     video_path = Column(String, nullable=False, unique=True)
 
     #complex JSON output from AI model
-    analysis_results = Column(JSONB, nullable=True)
+    #deferred: can be megabytes, so only loaded when a query asks for it
+    #none_as_null: Python None is SQL NULL, never the JSON value null
+    analysis_results = deferred(Column(JSONB(none_as_null=True), nullable=True))
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    #sha256 of the uploaded video, computed by the worker from the bytes it read
+    content_digest = Column(String(64), nullable=True)
+    #sha256 the client sent with the upload; unverified, only a dedup hint
+    client_digest = Column(String(64), nullable=True)
+    #pose model version that produced analysis_results; written in the same
+    #UPDATE as the results, so NOT NULL is what marks a run as analyzed
+    model_version = Column(String(64), nullable=True)
+
     # Foreign key to link this run to a user
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
 
     # Establish the relationship to the User model
-    owner = relationship("User", back_populates="runs")
\ No newline at end of file
+    owner = relationship("User", back_populates="runs")
+
+    __table_args__ = (
+        # Serves the keyset-paginated listing of a user's runs, newest first;
+        # INCLUDE carries the other listed columns, so pages are index-only scans
+        Index(
+            "ix_runs_user_id_created_at_id", user_id, created_at.desc(), id.desc(),
+            postgresql_include=["title", "video_path"]
+        ),
+        # Finds an earlier analysis of the same video by the same model
+        Index("ix_runs_content_digest_model_version", content_digest, model_version),
+    )
\ No newline at end of file
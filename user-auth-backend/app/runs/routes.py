@@ -1,45 +1,443 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import asyncio
+import base64
+import csv
+import io
+import json
+from datetime import datetime
 
-from app.deps.db import get_db
-from app.deps.auth import get_current_user
-from app.models.user import User
-from app.models.run import Run
-from .schemas import RunCreateIn, RunOut
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import Response, StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import Text, cast, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
+from starlette.concurrency import run_in_threadpool
 
-from app.core.queue import queue
-from app.tasks.video_processing import analyze_run_video
+from app.core.config import settings
+from app.core.responses import RawJSONResponse, dump_model, dumps, splice_json
+from app.core.progress import COMPLETED, TERMINAL_STATES, progress_broker, read_progress
+from app.db.replica import first_row, mark_recent_write, read_or_primary, wrote_recently
+from app.db.session import AsyncReadSessionLocal, AsyncSessionLocal
+from app.deps.db import get_async_db, get_async_read_db
+from app.deps.auth import get_current_user, get_user_read_db
+from app.core.user_cache import CachedUser
+from app.models.frame_data import RunFrameData
+from app.models.outbox import RunAnalysisOutbox
+from app.models.run import Run
+from .schemas import RunCreateIn, RunListItem, RunOut, RunPage
 
 router = APIRouter(prefix="/runs", tags=["runs"])
 
+# Prebuilt for the FAST_RESPONSES_ENABLED path
+_run_item_adapter = TypeAdapter(RunListItem)
+_run_page_adapter = TypeAdapter(RunPage)
+
+
+def _encode_cursor(created_at: datetime, run_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{run_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, run_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(run_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+MAX_SELECTED_FIELDS = 20
+
+
+def _parse_fields(fields: str) -> list[tuple[str, ...]]:
+    """Split ``summary,splits.0`` into JSONB paths, e.g. [("summary",), ("splits", "0")]."""
+    paths = [tuple(part.split(".")) for part in fields.split(",") if part]
+    if not paths or len(paths) > MAX_SELECTED_FIELDS or any("" in path for path in paths):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"fields must be 1-{MAX_SELECTED_FIELDS} comma-separated keys or dotted paths"
+        )
+    return paths
+
+
+def _set_path(target: dict, path: tuple[str, ...], value) -> None:
+    for key in path[:-1]:
+        if not isinstance(target.get(key), dict):
+            target[key] = {}
+        target = target[key]
+    target[path[-1]] = value
+
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+EXPORT_CSV_FIELDS = ("id", "title", "video_path", "created_at", "model_version")
+
+
+async def _export_rows(user_id: int, fmt: str, session_factory):
+    """
+    Yield the export body one partition of RUNS_EXPORT_BATCH_SIZE runs at a
+    time, read through a server-side cursor. analysis_results is fetched as
+    JSONB text and spliced into each line as is, so the (large) documents are
+    never parsed and re-encoded; memory stays at one partition.
+    """
+    columns = [Run.id, Run.title, Run.video_path, Run.created_at, Run.model_version]
+    if fmt == "ndjson":
+        columns.append(cast(Run.analysis_results, Text).label("analysis_results"))
+    stmt = (
+        select(*columns)
+        .where(Run.user_id == user_id)
+        .order_by(Run.created_at, Run.id)
+        .execution_options(yield_per=settings.RUNS_EXPORT_BATCH_SIZE)
+    )
+
+    if fmt == "csv":
+        header = io.StringIO()
+        csv.writer(header).writerow(EXPORT_CSV_FIELDS)
+        yield header.getvalue()
+
+    # A session of its own: the response body is produced after the
+    # request's dependencies have been torn down
+    async with session_factory() as db:
+        result = await db.stream(stmt)
+        async for partition in result.partitions():
+            if fmt == "csv":
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(
+                    (row.id, row.title, row.video_path, row.created_at.isoformat(), row.model_version)
+                    for row in partition
+                )
+                yield buffer.getvalue()
+            else:
+                lines = []
+                for row in partition:
+                    summary = dumps({
+                        "id": row.id,
+                        "title": row.title,
+                        "video_path": row.video_path,
+                        "created_at": row.created_at.isoformat(),
+                        "model_version": row.model_version,
+                    })
+                    lines.append(splice_json(summary, "analysis_results", row.analysis_results))
+                    lines.append(b"\n")
+                yield b"".join(lines)
+
+
+# Declared before /{run_id} so "export" is not taken for a run id
+@router.get("/export")
+async def export_runs(
+        format: str = Query("ndjson"),
+        current_user: CachedUser = Depends(get_current_user)
+):
+    """
+    All of the current user's runs, oldest first, as a chunked download:
+    NDJSON with analysis_results, or CSV of the summary fields.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"format must be one of: {', '.join(EXPORT_FORMATS)}"
+        )
+    # Replica unless the user just wrote something the export must include
+    session_factory = AsyncSessionLocal if await wrote_recently(current_user.id) else AsyncReadSessionLocal
+    return StreamingResponse(
+        _export_rows(current_user.id, format, session_factory),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="runs.{format}"'},
+    )
+
+
+def _run_summary_json(row) -> bytes:
+    """RunOut without analysis_results, encoded; the caller splices that in."""
+    return dump_model(
+        _run_item_adapter, RunListItem,
+        id=row.id, title=row.title, video_path=row.video_path, created_at=row.created_at, user_id=row.user_id
+    )
+
+
+@router.get("/{run_id}", response_model=RunOut)
+async def get_run(
+        run_id: int,
+        fields: str | None = None,
+        db: AsyncSession = Depends(get_async_read_db),
+        current_user: CachedUser = Depends(get_current_user)
+):
+    """
+    Return one of the current user's runs.
+
+    Without ``fields`` the whole analysis_results document is returned. With
+    ``?fields=summary,splits`` Postgres extracts only those keys (dotted names
+    are JSONB paths), so the rest of the document never leaves the database.
+
+    Reads go to the replica, and again to the primary only if the run is not
+    there yet. A run still being analyzed is served from the replica as is;
+    clients waiting for the result follow /runs/{run_id}/status or /events.
+    """
+    owned = (Run.id == run_id) & (Run.user_id == current_user.id)
+    summary_columns = (Run.id, Run.title, Run.video_path, Run.created_at, Run.user_id)
+
+    if fields is None and settings.FAST_RESPONSES_ENABLED:
+        # The document comes back as JSONB text and goes out unparsed
+        stmt = select(*summary_columns, cast(Run.analysis_results, Text).label("analysis_results")).where(owned)
+        row = await read_or_primary(db, lambda session: first_row(session, stmt))
+        if row is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Run not found")
+        return RawJSONResponse(splice_json(_run_summary_json(row), "analysis_results", row.analysis_results))
+
+    if fields is None:
+        stmt = select(Run).options(undefer(Run.analysis_results)).where(owned)
+        run = await read_or_primary(db, lambda session: session.scalar(stmt))
+        if run is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Run not found")
+        return run
+
+    paths = _parse_fields(fields)
+    selected = [
+        Run.analysis_results[path[0]] if len(path) == 1 else Run.analysis_results[path]
+        for path in paths
+    ]
+    stmt = select(*summary_columns, *selected).where(owned)
+    row = await read_or_primary(db, lambda session: first_row(session, stmt))
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Run not found")
+
+    # Deepest paths first, so ?fields=splits,splits.0 ends up with all of splits
+    analysis_results: dict = {}
+    for path, value in sorted(zip(paths, row[5:]), key=lambda item: -len(item[0])):
+        _set_path(analysis_results, path, value)
+    if settings.FAST_RESPONSES_ENABLED:
+        return RawJSONResponse(splice_json(_run_summary_json(row), "analysis_results", dumps(analysis_results)))
+    return RunOut(
+        id=row.id,
+        title=row.title,
+        video_path=row.video_path,
+        created_at=row.created_at,
+        user_id=row.user_id,
+        analysis_results=analysis_results
+    )
+
+
+@router.get("/", response_model=RunPage)
+async def list_runs(
+        cursor: str | None = None,
+        limit: int = Query(20, ge=1, le=100),
+        db: AsyncSession = Depends(get_user_read_db),
+        current_user: CachedUser = Depends(get_current_user)
+):
+    """
+    List the current user's runs, newest first.
+
+    Keyset pagination on (created_at, id) walks ix_runs_user_id_created_at_id
+    directly, so a page costs the same however deep it is, and the index
+    includes every listed column, so the table itself is not read.
+    """
+    stmt = (
+        select(Run.id, Run.title, Run.video_path, Run.created_at, Run.user_id)
+        .where(Run.user_id == current_user.id)
+        .order_by(Run.created_at.desc(), Run.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        created_at, run_id = _decode_cursor(cursor)
+        stmt = stmt.where(tuple_(Run.created_at, Run.id) < tuple_(created_at, run_id))
+
+    rows = (await db.execute(stmt)).all()
+    if settings.FAST_RESPONSES_ENABLED:
+        items = [RunListItem.model_construct(**row._mapping) for row in rows[:limit]]
+    else:
+        items = [RunListItem.model_validate(row) for row in rows[:limit]]
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = _encode_cursor(last.created_at, last.id)
+    if settings.FAST_RESPONSES_ENABLED:
+        return RawJSONResponse(dump_model(_run_page_adapter, RunPage, items=items, next_cursor=next_cursor))
+    return RunPage(items=items, next_cursor=next_cursor)
+
 
 @router.post("/", response_model=RunOut, status_code=status.HTTP_201_CREATED)
-def create_run_record(
+async def create_run_record(
         payload: RunCreateIn,
-        db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_user)
+        db: AsyncSession = Depends(get_async_db),
+        current_user: CachedUser = Depends(get_current_user)
 ):
     try:
         new_run = Run(
             video_path=payload.video_path,
             title=payload.title,
-            user_id=current_user.id
+            client_digest=payload.content_digest,
+            user_id=current_user.id,
+            # set explicitly so the deferred column is loaded for the response;
+            # stored as SQL NULL (the column is none_as_null), not JSON null
+            analysis_results=None
         )
 
 
         db.add(new_run)
-        db.commit()
-        db.refresh(new_run)
-
-        queue.enqueue(analyze_run_video, args=(new_run.id, new_run.video_path))
+        await db.flush()
+        # Same transaction as the run: dispatcher.py hands it to RQ later, so
+        # the request never waits on Redis and no committed run is missed.
+        db.add(RunAnalysisOutbox(run_id=new_run.id, video_path=new_run.video_path))
+        await db.commit()
+        await db.refresh(new_run, attribute_names=["created_at"])
+        await mark_recent_write(current_user.id)
 
         return new_run
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         # in prod, log it
         print(f"Error creating run record: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create run record in the database."
-        )
\ No newline at end of file
+        )
+
+@router.get("/{run_id}/status")
+async def get_run_status(
+        run_id: int,
+        current_user: CachedUser = Depends(get_current_user)
+):
+    """
+    Latest analysis progress, read from Redis only. 404 until the run has been
+    dispatched to a worker; after that it holds until PROGRESS_TTL_SECONDS
+    past the last update.
+    """
+    progress = await read_progress(run_id)
+    if progress is None or progress.get("user_id") != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No progress for this run")
+    return progress
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.get("/{run_id}/events")
+async def stream_run_events(
+        run_id: int,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: CachedUser = Depends(get_current_user)
+):
+    """
+    Server-Sent Events stream of analysis progress, closed after the
+    ``completed`` or ``failed`` event.
+    """
+    row = (await db.execute(
+        # model_version is only set once results are stored (see Run)
+        select(Run.model_version.is_not(None).label("analyzed"))
+        .where(Run.id == run_id, Run.user_id == current_user.id)
+    )).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Run not found")
+    # Hand the connection back now; the stream can stay open for minutes
+    await db.close()
+
+    analyzed = row.analyzed
+
+    async def events():
+        if analyzed:
+            yield _sse("progress", {"run_id": run_id, "state": COMPLETED, "percent": 100})
+            return
+
+        # Subscribe before reading the stored state so no update falls between
+        async with progress_broker.subscribe(run_id) as updates:
+            last = await read_progress(run_id)
+            if last is not None:
+                yield _sse("progress", last)
+            while last is None or last.get("state") not in TERMINAL_STATES:
+                try:
+                    update = await asyncio.wait_for(updates.get(), settings.PROGRESS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    # Keep proxies from closing the connection, and catch up in
+                    # case the listener dropped a message
+                    yield ": heartbeat\n\n"
+                    update = await read_progress(run_id)
+                    if update is None or update == last:
+                        continue
+                last = update
+                yield _sse("progress", last)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _decode_frame_arrays(
+        blob: bytes,
+        names: list[str],
+        joints: list[int] | None,
+        max_points: int | None
+) -> dict:
+    # Imported here so NumPy is not loaded at API startup, only on first use
+    from app.core.frame_codec import FrameData
+
+    frame_data = FrameData(blob)
+    unknown = [name for name in names if name not in frame_data.names]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown arrays: {', '.join(unknown)}; available: {', '.join(frame_data.names)}"
+        )
+
+    out = {}
+    for name in names:
+        array = frame_data.downsampled(name, max_points) if max_points else frame_data[name]
+        if joints is not None and array.ndim > 1:
+            # The joint axis is as wide as the keypoint set of the model that
+            # produced this run, so the valid range comes from the data
+            joint_count = array.shape[1]
+            if any(not 0 <= j < joint_count for j in joints):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"joints must be between 0 and {joint_count - 1}"
+                )
+            array = array[:, joints]
+        out[name] = array.tolist()
+    return out
+
+
+@router.get("/{run_id}/frames")
+async def get_run_frames(
+        run_id: int,
+        arrays: str = "timestamps,keypoints",
+        joints: str | None = None,
+        max_points: int | None = Query(None, ge=2, le=10000),
+        format: str = Query("json", pattern="^(json|raw)$"),
+        db: AsyncSession = Depends(get_async_read_db),
+        current_user: CachedUser = Depends(get_current_user)
+):
+    """
+    Per-frame analysis arrays of one of the current user's runs.
+
+    Only the requested arrays are decompressed. ``max_points`` strides them
+    down for charts and ``joints`` (e.g. ``15,16``) picks keypoint columns.
+    ``format=raw`` returns the encoded blob for clients that decode it
+    themselves (see app/core/frame_codec).
+    """
+    stmt = (
+        select(RunFrameData.data, RunFrameData.frames, RunFrameData.fps)
+        .join(Run, Run.id == RunFrameData.run_id)
+        .where(Run.id == run_id, Run.user_id == current_user.id)
+    )
+    row = await read_or_primary(db, lambda session: first_row(session, stmt))
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No frame data for this run")
+
+    if format == "raw":
+        return Response(content=row.data, media_type="application/octet-stream")
+
+    try:
+        joint_ids = [int(j) for j in joints.split(",")] if joints else None
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="joints must be comma-separated integers")
+
+    names = [name for name in arrays.split(",") if name]
+    # Decompression and tolist() are CPU-bound; keep them off the event loop
+    decoded = await run_in_threadpool(_decode_frame_arrays, bytes(row.data), names, joint_ids, max_points)
+    return {"run_id": run_id, "frames": row.frames, "fps": row.fps, **decoded}
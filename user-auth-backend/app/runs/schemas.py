@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional, Any
 
@@ -7,6 +7,10 @@ from typing import Optional, Any
 class RunCreateIn(BaseModel):
     video_path: str
     title: Optional[str] = None
+    # sha256 of the uploaded file (lowercase hex), computed by the client as
+    # it uploads; lets the worker find the analysis of an identical upload,
+    # which it verifies against the stored bytes before reusing
+    content_digest: Optional[str] = Field(None, pattern="^[0-9a-f]{64}$")
 
 # --- Output Schema ---
 # This defines what our API will return after successfully creating a run.
@@ -19,4 +23,22 @@ class RunOut(BaseModel):
     analysis_results: Optional[dict]
 
     class Config:
-        from_attributes = True # This allows Pydantic to read data from ORM models
\ No newline at end of file
+        from_attributes = True # This allows Pydantic to read data from ORM models
+
+# --- Listing Schemas ---
+# List items leave out analysis_results, which can be large.
+class RunListItem(BaseModel):
+    id: int
+    title: Optional[str]
+    video_path: str
+    created_at: datetime
+    user_id: int
+
+    class Config:
+        from_attributes = True
+
+
+class RunPage(BaseModel):
+    items: list[RunListItem]
+    # Pass back as ?cursor= to get the next page; null on the last page
+    next_cursor: Optional[str] = None
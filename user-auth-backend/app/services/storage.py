@@ -1,13 +1,17 @@
-import os
-from supabase import create_client, Client
-from dotenv import load_dotenv
+from app.core.config import settings
 
-load_dotenv()
+# Built on first use: importing this module must not require Supabase to be
+# configured or pay for the supabase-py import.
+_supabase_client = None
 
-SUPABASE_URL = os.environ.get("SUPABASE_URL")
-SUPABASE_SERVICE_KEY = os.environ.get("SUPABASE_SERVICE_KEY")
 
-if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
-    raise ValueError("Supabase URL and Service Key must be set in environment variables.")
+def get_supabase_client():
+    """Process-wide synchronous Supabase client (supabase.Client)."""
+    global _supabase_client
+    if _supabase_client is None:
+        from supabase import create_client
 
-supabase_client: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
\ No newline at end of file
+        if not settings.SUPABASE_URL or not settings.SUPABASE_SERVICE_KEY:
+            raise ValueError("Supabase URL and Service Key must be set in environment variables.")
+        _supabase_client = create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_KEY)
+    return _supabase_client
@@ -0,0 +1,108 @@
+"""
+Signed upload URLs for run videos, from the async API handlers.
+
+Supabase is called over one pooled, keep-alive (HTTP/2) httpx.AsyncClient
+per process, so issuing a URL costs an awaited request on an open
+connection instead of a blocking call on a threadpool thread.
+"""
+import asyncio
+import os
+from typing import Protocol
+
+import httpx
+
+from app.core.config import settings
+
+
+class UploadStorage(Protocol):
+    async def create_signed_upload_url(self, path: str) -> dict:
+        """Return ``{"upload_url": ..., "path": ...}`` for a new object at ``path``."""
+        ...
+
+    async def ping(self) -> None:
+        """Raise if the backend is unreachable; used by the health prober."""
+        ...
+
+    async def aclose(self) -> None:
+        ...
+
+
+class SupabaseUploadStorage:
+    """Talks to the Supabase Storage REST API directly (what storage3 wraps)."""
+
+    def __init__(self, base_url: str, service_key: str, bucket: str, max_connections: int):
+        self._storage_url = f"{base_url.rstrip('/')}/storage/v1"
+        self._bucket = bucket
+        self._client = httpx.AsyncClient(
+            http2=True,
+            timeout=10,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            headers={"apikey": service_key, "Authorization": f"Bearer {service_key}"},
+        )
+
+    async def create_signed_upload_url(self, path: str) -> dict:
+        response = await self._client.post(f"{self._storage_url}/object/upload/sign/{self._bucket}/{path}")
+        response.raise_for_status()
+        # {"url": "/object/upload/sign/<bucket>/<path>?token=..."}
+        url = response.json()["url"]
+        return {"upload_url": f"{self._storage_url}/{url.lstrip('/')}", "path": path}
+
+    async def ping(self) -> None:
+        response = await self._client.get(f"{self._storage_url}/bucket/{self._bucket}")
+        response.raise_for_status()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+class LocalUploadStorage:
+    """Stand-in for tests and local runs: hands out file:// URLs under a directory."""
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+
+    async def create_signed_upload_url(self, path: str) -> dict:
+        return {"upload_url": f"file://{os.path.join(self.root, path)}", "path": path}
+
+    async def ping(self) -> None:
+        if not os.path.isdir(self.root):
+            raise FileNotFoundError(f"Storage directory {self.root} does not exist")
+
+    async def aclose(self) -> None:
+        pass
+
+
+_upload_storage: UploadStorage | None = None
+
+
+def get_upload_storage() -> UploadStorage:
+    """Return the per-process upload storage selected by VIDEO_STORAGE_BACKEND."""
+    global _upload_storage
+    if _upload_storage is None:
+        if settings.VIDEO_STORAGE_BACKEND == "local":
+            _upload_storage = LocalUploadStorage(settings.VIDEO_STORAGE_LOCAL_ROOT)
+        elif settings.VIDEO_STORAGE_BACKEND == "supabase":
+            if not settings.SUPABASE_URL or not settings.SUPABASE_SERVICE_KEY:
+                raise ValueError("Supabase URL and Service Key must be set in environment variables.")
+            _upload_storage = SupabaseUploadStorage(
+                settings.SUPABASE_URL,
+                settings.SUPABASE_SERVICE_KEY,
+                settings.VIDEO_BUCKET,
+                max_connections=settings.STORAGE_MAX_CONNECTIONS,
+            )
+        else:
+            raise ValueError(f"Unknown VIDEO_STORAGE_BACKEND: {settings.VIDEO_STORAGE_BACKEND!r}")
+    return _upload_storage
+
+
+async def create_signed_upload_urls(paths: list[str]) -> list[dict]:
+    """Sign several uploads concurrently over the shared connection pool."""
+    storage = get_upload_storage()
+    return await asyncio.gather(*(storage.create_signed_upload_url(path) for path in paths))
+
+
+async def close_upload_storage() -> None:
+    global _upload_storage
+    if _upload_storage is not None:
+        await _upload_storage.aclose()
+        _upload_storage = None
@@ -0,0 +1,243 @@
+"""
+Bulk user import from CSV (``email,password`` header) or NDJSON
+(``{"email": ..., "password": ...}`` per line).
+
+Rows are processed in batches. Per batch: validate with the signup schema,
+drop emails that are already registered with one ``IN`` query, bcrypt the
+rest across a process pool, then write them with Postgres COPY into a
+staging table and one ``INSERT ... SELECT ... ON CONFLICT DO NOTHING`` (or a
+batched ``INSERT ... ON CONFLICT DO NOTHING`` on other databases). Hashing
+of the next batch overlaps the write of the previous one, so throughput is
+bounded by bcrypt and scales with the number of hashing processes.
+
+    python -m app.services.user_import users.csv
+    python -m app.services.user_import users.ndjson --format ndjson --workers 8
+"""
+import csv
+import io
+import json
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Iterable, Iterator, TextIO
+
+import bcrypt
+from pydantic import ValidationError
+from sqlalchemy import select, text
+
+from app.auth.schemas import SignUpIn
+from app.core.config import settings
+from app.db.session import engine
+from app.models.user import User
+
+FORMATS = ("csv", "ndjson")
+
+
+@dataclass
+class RowError:
+    line: int
+    email: str | None
+    error: str
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    created: int = 0
+    skipped_existing: int = 0
+    failed: int = 0
+    # Only the first IMPORT_MAX_REPORTED_ERRORS; ``failed`` counts all of them
+    errors: list[RowError] = field(default_factory=list)
+
+    def add_error(self, line: int, email: str | None, error: str) -> None:
+        self.failed += 1
+        if len(self.errors) < settings.IMPORT_MAX_REPORTED_ERRORS:
+            self.errors.append(RowError(line, email, error))
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def read_rows(stream: TextIO, fmt: str) -> Iterator[tuple[int, dict | None]]:
+    """Yield (line number, row) pairs; row is None for a line that cannot be parsed."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == "ndjson":
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield line_number, row if isinstance(row, dict) else None
+    else:
+        raise ValueError(f"Unknown import format: {fmt!r}")
+
+
+def _hash_passwords(passwords: list[str], rounds: int) -> list[str]:
+    """Runs in the pool processes."""
+    return [bcrypt.hashpw(p.encode("utf-8"), bcrypt.gensalt(rounds=rounds)).decode("utf-8") for p in passwords]
+
+
+def _batches(rows: Iterable, size: int) -> Iterator[list]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _existing_emails(emails: list[str]) -> set[str]:
+    with engine.connect() as conn:
+        return set(conn.scalars(select(User.email).where(User.email.in_(emails))))
+
+
+def _insert_copy(rows: list[tuple[str, str]]) -> int:
+    """COPY into a staging table, then one conflict-tolerant INSERT ... SELECT."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TEMP TABLE user_import_staging "
+            "(email varchar(255), hashed_password varchar(255)) ON COMMIT DROP"
+        ))
+        with conn.connection.cursor() as cursor:
+            cursor.copy_expert("COPY user_import_staging (email, hashed_password) FROM STDIN WITH (FORMAT csv)", buffer)
+        result = conn.execute(text(
+            "INSERT INTO users (email, hashed_password) "
+            "SELECT email, hashed_password FROM user_import_staging "
+            "ON CONFLICT (email) DO NOTHING"
+        ))
+        return result.rowcount
+
+
+def _insert_batched(rows: list[tuple[str, str]]) -> int:
+    if engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    stmt = (
+        insert(User)
+        .values([{"email": email, "hashed_password": hashed} for email, hashed in rows])
+        .on_conflict_do_nothing(index_elements=[User.email])
+    )
+    with engine.begin() as conn:
+        return conn.execute(stmt).rowcount
+
+
+def import_users(
+        stream: TextIO,
+        fmt: str = "csv",
+        workers: int | None = None,
+        batch_size: int | None = None,
+        method: str | None = None,
+        on_progress: Callable[[ImportReport], None] | None = None
+) -> ImportReport:
+    """
+    Import users from ``stream``. Existing emails are skipped, invalid rows
+    recorded in the report; ``on_progress`` is called after every batch.
+    """
+    workers = workers or settings.IMPORT_HASH_WORKERS or os.cpu_count() or 1
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    method = method or ("copy" if engine.dialect.driver == "psycopg2" else "insert")
+    insert_rows = _insert_copy if method == "copy" else _insert_batched
+    rounds = settings.BCRYPT_ROUNDS
+    # Enough work per task to amortise the inter-process round trip, while
+    # still spreading one batch over every process
+    chunk_size = max(1, min(64, batch_size // workers))
+
+    report = ImportReport()
+    seen: set[str] = set()
+
+    def prepare(batch: list[tuple[int, dict | None]]) -> tuple[list[str], list[Future]]:
+        valid: list[SignUpIn] = []
+        for line, row in batch:
+            report.rows += 1
+            if row is None:
+                report.add_error(line, None, "unparseable row")
+                continue
+            try:
+                user = SignUpIn.model_validate({"email": row.get("email"), "password": row.get("password")})
+            except ValidationError as e:
+                report.add_error(line, row.get("email"), "; ".join(err["msg"] for err in e.errors()))
+                continue
+            if len(user.password.encode("utf-8")) > 72:
+                report.add_error(line, user.email, "Password cannot exceed 72 bytes")
+                continue
+            if user.email in seen:
+                report.add_error(line, user.email, "duplicate email in import")
+                continue
+            seen.add(user.email)
+            valid.append(user)
+
+        existing = _existing_emails([user.email for user in valid]) if valid else set()
+        report.skipped_existing += len(existing)
+        new = [user for user in valid if user.email not in existing]
+        futures = [
+            pool.submit(_hash_passwords, [user.password for user in new[i:i + chunk_size]], rounds)
+            for i in range(0, len(new), chunk_size)
+        ]
+        return [user.email for user in new], futures
+
+    def write(emails: list[str], futures: list[Future]) -> None:
+        hashes = [hashed for future in futures for hashed in future.result()]
+        if emails:
+            created = insert_rows(list(zip(emails, hashes)))
+            report.created += created
+            # Registered by someone else between the lookup and the insert
+            report.skipped_existing += len(emails) - created
+        if on_progress is not None:
+            on_progress(report)
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        pending = None
+        for batch in _batches(read_rows(stream, fmt), batch_size):
+            prepared = prepare(batch)
+            if pending is not None:
+                write(*pending)
+            pending = prepared
+        if pending is not None:
+            write(*pending)
+
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    import time
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="file to import, or - for stdin")
+    parser.add_argument("--format", choices=FORMATS, help="default: from the file extension, else csv")
+    parser.add_argument("--workers", type=int, help="hashing processes (default IMPORT_HASH_WORKERS or one per core)")
+    parser.add_argument("--batch-size", type=int)
+    parser.add_argument("--method", choices=("copy", "insert"), help="default: copy on Postgres")
+    args = parser.parse_args()
+
+    fmt = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+    started = time.perf_counter()
+
+    def print_progress(report: ImportReport) -> None:
+        elapsed = time.perf_counter() - started
+        print(
+            f"{report.rows} rows: {report.created} created, {report.skipped_existing} existing, "
+            f"{report.failed} failed ({report.created / elapsed:.1f} users/s)"
+        )
+
+    with (sys.stdin if args.path == "-" else open(args.path, newline="", encoding="utf-8")) as source:
+        result = import_users(
+            source, fmt, workers=args.workers, batch_size=args.batch_size, method=args.method,
+            on_progress=print_progress
+        )
+    for error in result.errors:
+        print(f"line {error.line}: {error.email or '-'}: {error.error}")
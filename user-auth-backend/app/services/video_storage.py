@@ -0,0 +1,137 @@
+import io
+import os
+from collections import OrderedDict
+from typing import BinaryIO, Protocol
+
+import httpx
+
+from app.core.config import settings
+
+
+class VideoStorage(Protocol):
+    """Where uploaded run videos are read from."""
+
+    def open(self, path: str) -> BinaryIO:
+        """Open a video for reading. The stream is seekable but never fully buffered."""
+        ...
+
+
+class LocalVideoStorage:
+    """Reads videos from a directory; used in tests, benchmarks and local runs."""
+
+    def __init__(self, root: str):
+        self.root = os.path.realpath(root)
+
+    def open(self, path: str) -> BinaryIO:
+        # path comes from the client (RunCreateIn.video_path), so "../" and
+        # absolute paths or symlinks must not reach outside the root
+        full_path = os.path.realpath(os.path.join(self.root, path))
+        if os.path.commonpath([self.root, full_path]) != self.root:
+            raise ValueError(f"Video path is outside the storage root: {path!r}")
+        return open(full_path, "rb")
+
+
+class HTTPRangeReader(io.RawIOBase):
+    """
+    Seekable read-only file over HTTP Range requests.
+
+    Reads are served from fixed-size blocks, of which only the most recent
+    ``max_blocks`` are kept, so memory stays bounded however large the file is.
+    The blocks cache matters for MP4, where the demuxer jumps between the
+    moov atom and the sample data.
+    """
+
+    def __init__(self, url: str, block_size: int, max_blocks: int = 4, client: httpx.Client | None = None):
+        self._url = url
+        self._block_size = block_size
+        self._max_blocks = max_blocks
+        self._client = client or httpx.Client(timeout=30, follow_redirects=True)
+        self._owns_client = client is None
+        self._blocks: OrderedDict[int, bytes] = OrderedDict()
+        self._pos = 0
+        self._size: int | None = None
+        self._fetch_block(0)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        elif whence == io.SEEK_END:
+            self._pos = self._size + offset
+        else:
+            raise ValueError(f"invalid whence: {whence}")
+        if self._pos < 0:
+            raise ValueError("negative seek position")
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        if self._pos >= self._size:
+            return 0
+        index, offset = divmod(self._pos, self._block_size)
+        block = self._fetch_block(index)
+        n = min(len(buffer), len(block) - offset)
+        buffer[:n] = block[offset:offset + n]
+        self._pos += n
+        return n
+
+    def close(self) -> None:
+        if not self.closed and self._owns_client:
+            self._client.close()
+        self._blocks.clear()
+        super().close()
+
+    def _fetch_block(self, index: int) -> bytes:
+        block = self._blocks.get(index)
+        if block is not None:
+            self._blocks.move_to_end(index)
+            return block
+
+        start = index * self._block_size
+        end = start + self._block_size - 1
+        response = self._client.get(self._url, headers={"Range": f"bytes={start}-{end}"})
+        response.raise_for_status()
+        if response.status_code != httpx.codes.PARTIAL_CONTENT:
+            raise IOError("Storage server ignored the Range header")
+        if self._size is None:
+            # Content-Range: bytes 0-1048575/73400320
+            self._size = int(response.headers["content-range"].rsplit("/", 1)[1])
+
+        block = response.content
+        self._blocks[index] = block
+        while len(self._blocks) > self._max_blocks:
+            self._blocks.popitem(last=False)
+        return block
+
+
+class SupabaseVideoStorage:
+    """Streams videos out of a Supabase Storage bucket through a signed URL."""
+
+    def __init__(self, bucket: str, block_size: int):
+        self.bucket = bucket
+        self.block_size = block_size
+
+    def open(self, path: str) -> BinaryIO:
+        from app.services.storage import get_supabase_client
+
+        signed = get_supabase_client().storage.from_(self.bucket).create_signed_url(path, 3600)
+        url = signed.get("signedURL") or signed.get("signedUrl")
+        return io.BufferedReader(HTTPRangeReader(url, block_size=self.block_size), buffer_size=self.block_size)
+
+
+def get_video_storage() -> VideoStorage:
+    """Return the storage backend selected by VIDEO_STORAGE_BACKEND."""
+    if settings.VIDEO_STORAGE_BACKEND == "local":
+        return LocalVideoStorage(settings.VIDEO_STORAGE_LOCAL_ROOT)
+    if settings.VIDEO_STORAGE_BACKEND == "supabase":
+        return SupabaseVideoStorage(settings.VIDEO_BUCKET, block_size=settings.VIDEO_READ_CHUNK_BYTES)
+    raise ValueError(f"Unknown VIDEO_STORAGE_BACKEND: {settings.VIDEO_STORAGE_BACKEND!r}")
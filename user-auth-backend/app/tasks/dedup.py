@@ -0,0 +1,136 @@
+"""
+Reuse of analysis results for re-uploaded videos.
+
+Run.content_digest is only ever the sha256 the worker computed from the
+bytes it read, as the single-pass analysis streams the video, never in a
+separate pass. Clients may send their own digest with the upload
+(POST /runs/, stored as Run.client_digest); it is only a hint. If an
+analyzed run with that verified digest exists for the current model
+version, the worker hashes the upload, and only if it really matches are
+the results copied inside Postgres instead of running the pipeline. A wrong
+or made-up client digest costs one extra read, never a false reuse.
+
+Hits and misses are counted in Redis so every worker contributes to one hit
+rate, exported as run_dedup_lookups_total (app/core/metrics.py).
+"""
+import hashlib
+import io
+from typing import BinaryIO
+
+from sqlalchemy import literal, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.frame_data import RunFrameData
+from app.models.run import Run
+
+DEDUP_STATS_KEY = "run-dedup-stats"
+
+
+class HashingReader(io.RawIOBase):
+    """
+    Seekable pass-through over ``stream`` that computes its sha256 from the
+    bytes the consumer reads.
+
+    Bytes are hashed in file order: a read extending past everything hashed
+    so far feeds the hash, reads elsewhere (the demuxer jumping to an MP4's
+    moov atom, say) do not. ``hexdigest`` then reads only what was never
+    reached that way, typically nothing or the trailing index.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self._stream = stream
+        self._digest = hashlib.sha256()
+        self._hashed = 0
+        self._pos = stream.tell()
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._pos = self._stream.seek(offset, whence)
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        n = self._stream.readinto(buffer)
+        if n:
+            end = self._pos + n
+            if self._pos <= self._hashed < end:
+                self._digest.update(memoryview(buffer)[self._hashed - self._pos:n])
+                self._hashed = end
+            self._pos = end
+        return n
+
+    def hexdigest(self, chunk_size: int) -> str:
+        """Finish the digest, reading whatever was skipped in ``chunk_size`` pieces."""
+        self.seek(self._hashed)
+        while self.read(chunk_size):
+            pass
+        return self._digest.hexdigest()
+
+
+def find_reusable_analysis(db: Session, run_id: int, digest: str, model_version: str) -> int | None:
+    """
+    Id of the latest other run whose verified digest is ``digest`` and that
+    ``model_version`` finished analyzing (model_version is only set then).
+    """
+    return db.scalar(
+        select(Run.id)
+        .where(
+            Run.content_digest == digest,
+            Run.model_version == model_version,
+            Run.id != run_id,
+        )
+        .order_by(Run.id.desc())
+        .limit(1)
+    )
+
+
+def copy_analysis(db: Session, run_id: int, source_id: int, digest: str, model_version: str) -> None:
+    """
+    Copy the results and frame data of ``source_id`` to ``run_id``, whose
+    bytes hashed to ``digest``. The caller commits.
+    """
+    # Copied by the database; the JSONB never passes through the worker
+    db.execute(
+        update(Run)
+        .where(Run.id == run_id)
+        .values(
+            analysis_results=select(Run.analysis_results).where(Run.id == source_id).scalar_subquery(),
+            content_digest=digest,
+            model_version=model_version,
+        )
+    )
+    db.execute(
+        insert(RunFrameData)
+        .from_select(
+            ["run_id", "frames", "fps", "data"],
+            select(literal(run_id), RunFrameData.frames, RunFrameData.fps, RunFrameData.data)
+            .where(RunFrameData.run_id == source_id)
+        )
+        .on_conflict_do_nothing(index_elements=[RunFrameData.run_id])
+    )
+
+
+def record_dedup(conn, hit: bool) -> None:
+    try:
+        conn.hincrby(DEDUP_STATS_KEY, "hits" if hit else "misses", 1)
+    except Exception as e:
+        print(f"Failed to record dedup stats: {e}")
+
+
+def dedup_stats_from(raw: dict) -> dict:
+    hits = int(raw.get(b"hits", 0))
+    misses = int(raw.get(b"misses", 0))
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / total, 4) if total else 0.0,
+    }
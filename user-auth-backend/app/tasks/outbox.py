@@ -0,0 +1,84 @@
+"""
+Moves run-analysis jobs from the outbox table to RQ.
+
+Rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so several
+dispatchers can run side by side without double-dispatching. Each batch is
+written to Redis in one pipeline and only then marked dispatched in the same
+database transaction. Job ids are derived from the run id, so if a
+dispatcher dies between the Redis write and the commit, the retry sees the
+job already exists and does not enqueue it again.
+"""
+from datetime import datetime, timedelta, timezone
+
+from rq import Queue
+from rq.job import Job
+from sqlalchemy import delete, select
+
+from app.core.config import settings
+from app.core.progress import QUEUED, publish_progress
+from app.db.session import SessionLocal
+from app.models.outbox import RunAnalysisOutbox
+from app.models.run import Run
+from app.tasks.video_processing import analyze_run_video
+
+
+def job_id_for_run(run_id: int) -> str:
+    return f"analyze-run-{run_id}"
+
+
+def dispatch_pending(queue: Queue, batch_size: int) -> int:
+    """Enqueue up to ``batch_size`` pending rows; returns how many were claimed."""
+    with SessionLocal() as db:
+        claimed = db.execute(
+            select(RunAnalysisOutbox, Run.user_id)
+            .join(Run, Run.id == RunAnalysisOutbox.run_id)
+            .where(RunAnalysisOutbox.dispatched_at.is_(None))
+            .order_by(RunAnalysisOutbox.id)
+            .limit(batch_size)
+            .with_for_update(of=RunAnalysisOutbox, skip_locked=True)
+        ).all()
+        if not claimed:
+            return 0
+        rows = [row for row, _ in claimed]
+
+        job_ids = [job_id_for_run(row.run_id) for row in rows]
+        with queue.connection.pipeline() as pipe:
+            for job_id in job_ids:
+                pipe.exists(Job.key_for(job_id))
+            already_enqueued = pipe.execute()
+
+        pending = [
+            (row, user_id, job_id)
+            for (row, user_id), job_id, exists in zip(claimed, job_ids, already_enqueued)
+            if not exists
+        ]
+        if pending:
+            jobs = [
+                Queue.prepare_data(
+                    analyze_run_video, args=(row.run_id, row.video_path), job_id=job_id,
+                    timeout=settings.ANALYSIS_JOB_TIMEOUT_SECONDS
+                )
+                for row, _, job_id in pending
+            ]
+            with queue.connection.pipeline() as pipe:
+                queue.enqueue_many(jobs, pipeline=pipe)
+                for row, user_id, _ in pending:
+                    publish_progress(pipe, row.run_id, user_id, QUEUED, percent=0)
+                pipe.execute()
+
+        now = datetime.now(timezone.utc)
+        for row in rows:
+            row.dispatched_at = now
+        db.commit()
+        return len(rows)
+
+
+def prune_dispatched(retention: timedelta) -> int:
+    """Delete rows dispatched more than ``retention`` ago."""
+    cutoff = datetime.now(timezone.utc) - retention
+    with SessionLocal() as db:
+        result = db.execute(
+            delete(RunAnalysisOutbox).where(RunAnalysisOutbox.dispatched_at < cutoff)
+        )
+        db.commit()
+        return result.rowcount
@@ -0,0 +1,161 @@
+"""
+Running biomechanics from pose keypoint time series.
+
+Input is a contiguous ``(frames, joints, 2)`` array of image coordinates in
+COCO keypoint order (y grows downwards), sampled at a constant ``fps``. Every
+metric is computed with whole-array NumPy operations: ground contacts come
+from rolling max/min windows over strided views of ankle height, foot
+strikes are the rising edges of those contacts, and nothing iterates frame
+by frame in Python.
+
+Distances assume side-on footage. Pixels are converted to metres using the
+runner's height, via the median hip-to-ankle length seen in the video.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+LEFT_HIP, RIGHT_HIP = 11, 12
+LEFT_ANKLE, RIGHT_ANKLE = 15, 16
+
+# Hip-to-ankle length as a fraction of standing height
+LEG_LENGTH_RATIO = 0.49
+# A foot cannot strike again within this many seconds (150 strides/min)
+MIN_STRIDE_SECONDS = 0.4
+# Share of each local ankle range counted as "on the ground"
+CONTACT_BAND = 0.15
+
+
+def _rolling(x: np.ndarray, window: int, reduce) -> np.ndarray:
+    """Centred rolling reduction along axis 0, edge-padded to keep the length."""
+    half = window // 2
+    padded = np.pad(x, [(half, window - 1 - half)] + [(0, 0)] * (x.ndim - 1), mode="edge")
+    return reduce(sliding_window_view(padded, window, axis=0), axis=-1)
+
+
+def _smooth(x: np.ndarray, window: int) -> np.ndarray:
+    """Centred moving average along axis 0 via cumulative sums."""
+    if window <= 1:
+        return x
+    half = window // 2
+    padded = np.pad(x, [(half, window - 1 - half)] + [(0, 0)] * (x.ndim - 1), mode="edge")
+    csum = np.cumsum(padded, axis=0, dtype=np.float64)
+    csum = np.concatenate([np.zeros((1,) + x.shape[1:]), csum])
+    return ((csum[window:] - csum[:-window]) / window).astype(x.dtype, copy=False)
+
+
+def ground_contacts(ankle_y: np.ndarray, min_distance: int, fps: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Start and end frames of each complete ground contact of one foot.
+
+    A foot is on the ground while its ankle is within CONTACT_BAND of its
+    lowest point in the image (largest y) over the surrounding stride. The
+    start of each contact is the foot strike.
+    """
+    window = 2 * min_distance + 1
+    local_max = _rolling(ankle_y, window, np.max)
+    local_min = _rolling(ankle_y, window, np.min)
+    swing = local_max - local_min
+    # Flat stretches (foot out of frame, standing still) are not contacts
+    on_ground = (ankle_y >= local_max - CONTACT_BAND * swing) & (swing > 0.25 * np.median(swing))
+
+    # Close one-or-two-frame gaps caused by keypoint jitter at the band edge
+    gap = max(3, int(round(0.04 * fps)) | 1)
+    on_ground = _rolling(_rolling(on_ground, gap, np.max), gap, np.min)
+
+    edges = np.diff(on_ground.astype(np.int8))
+    starts = np.flatnonzero(edges == 1) + 1
+    ends = np.flatnonzero(edges == -1) + 1
+    # Only count contacts that both start and end inside the clip
+    if starts.size and ends.size and ends[0] <= starts[0]:
+        ends = ends[1:]
+    n = min(starts.size, ends.size)
+    starts, ends = starts[:n], ends[:n]
+
+    # A foot cannot strike twice within min_distance; merge such contacts
+    keep = np.diff(starts, prepend=-min_distance - 1) > min_distance
+    merged_ends = ends[np.append(np.flatnonzero(keep)[1:] - 1, n - 1)] if n else ends
+    return starts[keep], merged_ends
+
+
+def _pace_splits(strike_times: np.ndarray, distance: np.ndarray, split_distance_m: float) -> list[dict]:
+    if distance.size == 0 or distance[-1] < split_distance_m:
+        return []
+    boundaries = np.arange(split_distance_m, distance[-1] + 1e-9, split_distance_m)
+    times = np.interp(boundaries, distance, strike_times)
+    seconds = np.diff(times, prepend=strike_times[0])
+    pace = seconds * (1000.0 / split_distance_m)
+    return [
+        {"distance_m": float(b), "seconds": round(float(s), 2), "pace_s_per_km": round(float(p), 1)}
+        for b, s, p in zip(boundaries, seconds, pace)
+    ]
+
+
+def compute_running_metrics(
+        keypoints: np.ndarray,
+        fps: float,
+        height_m: float = 1.75,
+        split_distance_m: float = 1000.0
+) -> dict:
+    """
+    Cadence, stride length, ground contact time, vertical oscillation and
+    pace splits for one run.
+
+    Args:
+        keypoints: ``(frames, joints, 2)`` x/y image coordinates
+        fps: Frame rate of ``keypoints``
+        height_m: Runner's height, used to convert pixels to metres
+        split_distance_m: Distance of each pace split
+
+    Returns:
+        JSON-serialisable dict stored under ``analysis_results["metrics"]``
+    """
+    keypoints = np.ascontiguousarray(keypoints, dtype=np.float32)
+    if keypoints.ndim != 3 or keypoints.shape[2] != 2 or keypoints.shape[1] <= RIGHT_ANKLE:
+        raise ValueError(f"keypoints must be (frames, >={RIGHT_ANKLE + 1}, 2), got {keypoints.shape}")
+
+    min_distance = max(1, int(MIN_STRIDE_SECONDS * fps))
+    if keypoints.shape[0] < 4 * min_distance:
+        return {"steps": 0}
+
+    smoothed = _smooth(keypoints, max(1, int(round(fps / 30))))
+    ankles_y = smoothed[:, [LEFT_ANKLE, RIGHT_ANKLE], 1]
+    ankles_x = smoothed[:, [LEFT_ANKLE, RIGHT_ANKLE], 0]
+    hips = smoothed[:, [LEFT_HIP, RIGHT_HIP]]
+
+    leg_px = np.median(np.linalg.norm(hips - smoothed[:, [LEFT_ANKLE, RIGHT_ANKLE]], axis=-1))
+    metres_per_px = (LEG_LENGTH_RATIO * height_m) / leg_px if leg_px > 0 else 0.0
+
+    left_starts, left_ends = ground_contacts(ankles_y[:, 0], min_distance, fps)
+    right_starts, right_ends = ground_contacts(ankles_y[:, 1], min_distance, fps)
+    strikes = np.sort(np.concatenate([left_starts, right_starts]))
+    if strikes.size < 2:
+        return {"steps": int(strikes.size)}
+
+    strike_times = strikes / fps
+    step_seconds = np.diff(strike_times)
+    cadence = 60.0 * (strikes.size - 1) / (strike_times[-1] - strike_times[0])
+
+    # Step length: horizontal gap between the ankles at each foot strike
+    step_lengths = np.abs(ankles_x[strikes, 0] - ankles_x[strikes, 1]) * metres_per_px
+    distance = np.concatenate([[0.0], np.cumsum(step_lengths[1:])])
+    total_distance = float(distance[-1])
+    total_seconds = float(strike_times[-1] - strike_times[0])
+
+    contact = np.concatenate([left_ends - left_starts, right_ends - right_starts]) / fps
+
+    # Vertical oscillation: hip rise and fall over one step
+    step_frames = max(3, int(round(np.median(step_seconds) * fps)) | 1)
+    hip_y = hips[:, :, 1].mean(axis=1)
+    oscillation = _rolling(hip_y, step_frames, np.max) - _rolling(hip_y, step_frames, np.min)
+
+    return {
+        "steps": int(strikes.size),
+        "cadence_spm": round(float(cadence), 1),
+        "step_length_m": round(float(np.median(step_lengths)), 3),
+        "stride_length_m": round(float(2 * np.median(step_lengths)), 3),
+        "ground_contact_ms": round(float(np.median(contact) * 1000), 1) if contact.size else None,
+        "vertical_oscillation_cm": round(float(np.median(oscillation) * metres_per_px * 100), 1),
+        "distance_m": round(total_distance, 1),
+        "pace_s_per_km": round(total_seconds / total_distance * 1000, 1) if total_distance else None,
+        "splits": _pace_splits(strike_times, distance, split_distance_m),
+    }
@@ -0,0 +1,471 @@
+"""
+Streaming video analysis pipeline.
+
+    storage stream -> decode -> sample -> inference -> aggregate
+
+Every stage is a generator over the previous one, and decode runs on its own
+thread behind a bounded queue, so decoding overlaps inference while at most a
+fixed number of frames are in flight. Nothing holds the whole video: storage
+reads are chunked, frames are dropped as soon as they are sampled out or
+inferred, and the aggregator only keeps compact per-frame series (timestamp,
+keypoint x/y and confidence: 157 bytes per sampled frame). Decoded frames,
+the dominant cost, never accumulate.
+"""
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, Protocol, TypeVar
+
+import numpy as np
+
+from app.core.config import settings
+from app.tasks.running_metrics import compute_running_metrics
+
+T = TypeVar("T")
+
+NUM_KEYPOINTS = 17
+
+
+@dataclass
+class StageStats:
+    """Frames a stage produced and the time it spent producing them."""
+    name: str
+    frames: int = 0
+    busy_seconds: float = 0.0
+
+    @property
+    def fps(self) -> float:
+        return self.frames / self.busy_seconds if self.busy_seconds else 0.0
+
+    def as_dict(self) -> dict:
+        return {"frames": self.frames, "seconds": round(self.busy_seconds, 3), "fps": round(self.fps, 1)}
+
+
+@dataclass(slots=True)
+class DecodedFrame:
+    index: int
+    timestamp: float
+    frame: Any  # av.VideoFrame, converted to pixels only if it survives sampling
+
+
+@dataclass(slots=True)
+class FrameResult:
+    index: int
+    timestamp: float
+    keypoints: np.ndarray  # (NUM_KEYPOINTS, 3): x, y, confidence
+
+
+class PoseModel(Protocol):
+    def predict(self, images: list[np.ndarray]) -> list[np.ndarray]:
+        """Return one (NUM_KEYPOINTS, 3) keypoint array per RGB image."""
+        ...
+
+
+class PlaceholderPoseModel:
+    """Stands in until the real pose model is wired up; reports no keypoints."""
+
+    def predict(self, images: list[np.ndarray]) -> list[np.ndarray]:
+        return [np.zeros((NUM_KEYPOINTS, 3), dtype=np.float32) for _ in images]
+
+
+_model: PoseModel | None = None
+_model_lock = threading.Lock()
+
+
+def get_pose_model() -> PoseModel:
+    """
+    Return this process's model, loading it on first use.
+
+    Loaded at most once per process: a warm worker loads it before forking
+    (see app/tasks/warmup.py) and every job reuses it.
+    """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model = PlaceholderPoseModel()
+                # Once per worker in the logs; a line per job means the preload is not shared
+                print(f"Loaded pose model in pid {os.getpid()}")
+    return _model
+
+
+def _measured(stats: StageStats, iterable: Iterable[T]) -> Iterator[T]:
+    """Yield from ``iterable``, charging the time spent in each next() to ``stats``."""
+    it = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(it)
+        except StopIteration:
+            stats.busy_seconds += time.perf_counter() - start
+            return
+        stats.busy_seconds += time.perf_counter() - start
+        stats.frames += 1
+        yield item
+
+
+def bounded(iterable: Iterable[T], maxsize: int, name: str) -> Iterator[T]:
+    """
+    Run ``iterable`` on a background thread, handing items over through a
+    queue of at most ``maxsize``. The producer blocks when the consumer falls
+    behind and stops when the consumer goes away.
+    """
+    items: queue.Queue = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    done = object()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+            put(done)
+        except BaseException as e:
+            put(e)
+        finally:
+            # Close generators on this thread so e.g. the container is released here
+            close = getattr(iterable, "close", None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=produce, name=f"pipeline-{name}", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = items.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def probe_duration(stream: BinaryIO) -> float:
+    """Length of the first video stream in seconds, from the container headers."""
+    import av
+
+    with av.open(stream, mode="r") as container:
+        video = container.streams.video[0]
+        if video.duration is not None and video.time_base:
+            return float(video.duration * video.time_base)
+        return (container.duration or 0) / av.time_base
+
+
+def decode_frames(
+        stream: BinaryIO,
+        stats: StageStats,
+        start: float = 0.0,
+        end: float | None = None,
+        threaded: bool = True
+) -> Iterator[DecodedFrame]:
+    """
+    Demux and decode the first video stream of ``stream`` frame by frame,
+    yielding only frames with ``start <= timestamp < end``.
+
+    ``threaded`` enables FFmpeg's own decoder threads; leave it off when
+    several segments are already decoding in parallel processes.
+    """
+    import av
+
+    with av.open(stream, mode="r") as container:
+        video = container.streams.video[0]
+        if threaded:
+            video.thread_type = "AUTO"
+        time_base = float(video.time_base) if video.time_base else 0.0
+        if start > 0 and time_base:
+            # Lands on the keyframe at or before start; earlier frames are skipped below
+            container.seek(int(start / time_base), stream=video)
+
+        index = 0
+        for frame in _measured(stats, container.decode(video)):
+            timestamp = frame.pts * time_base if frame.pts is not None else 0.0
+            if timestamp < start:
+                continue
+            if end is not None and timestamp >= end:
+                return
+            yield DecodedFrame(index=index, timestamp=timestamp, frame=frame)
+            index += 1
+
+
+def sample_frames(frames: Iterable[DecodedFrame], target_fps: float, stats: StageStats) -> Iterator[DecodedFrame]:
+    """
+    Keep the first frame in each 1/target_fps slot of video time.
+
+    Slots are counted from t=0 rather than from the first frame seen, so a
+    segment starting on a slot boundary samples exactly the frames a single
+    pass over the whole video would.
+    """
+    last_slot = -1
+    for decoded in frames:
+        start = time.perf_counter()
+        slot = int(decoded.timestamp * target_fps) if target_fps > 0 else last_slot + 1
+        keep = slot > last_slot
+        if keep:
+            last_slot = slot
+        stats.busy_seconds += time.perf_counter() - start
+        if keep:
+            stats.frames += 1
+            yield decoded
+
+
+def run_inference(
+        frames: Iterable[DecodedFrame],
+        model: PoseModel,
+        batch_size: int,
+        stats: StageStats
+) -> Iterator[FrameResult]:
+    """Convert sampled frames to RGB and run the model on them in batches."""
+    batch: list[DecodedFrame] = []
+
+    def flush() -> Iterator[FrameResult]:
+        start = time.perf_counter()
+        images = [decoded.frame.to_ndarray(format="rgb24") for decoded in batch]
+        keypoints = model.predict(images)
+        stats.busy_seconds += time.perf_counter() - start
+        stats.frames += len(batch)
+        for decoded, points in zip(batch, keypoints):
+            yield FrameResult(index=decoded.index, timestamp=decoded.timestamp, keypoints=points)
+        batch.clear()
+
+    for decoded in frames:
+        batch.append(decoded)
+        if len(batch) >= batch_size:
+            yield from flush()
+    if batch:
+        yield from flush()
+
+
+class RunAggregator:
+    """
+    Per-run accumulator. Per-frame timestamps, keypoint x/y and quantized
+    confidences go into preallocated buffers that double when full, so the
+    metrics and the stored frame data get contiguous arrays at the end.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.frames = 0
+        self.first_timestamp: float | None = None
+        self.last_timestamp = 0.0
+        self.confidence_sum = np.zeros(NUM_KEYPOINTS, dtype=np.float64)
+        self._buffers = {
+            "timestamps": np.empty(capacity, dtype=np.float32),
+            "keypoints": np.empty((capacity, NUM_KEYPOINTS, 2), dtype=np.float32),
+            # confidence * 255; two decimals is all a chart or filter needs
+            "confidence": np.empty((capacity, NUM_KEYPOINTS), dtype=np.uint8),
+        }
+
+    def _reserve(self, total: int) -> None:
+        capacity = len(self._buffers["timestamps"])
+        if total <= capacity:
+            return
+        capacity = max(total, 2 * capacity)
+        for name, buffer in self._buffers.items():
+            grown = np.empty((capacity,) + buffer.shape[1:], dtype=buffer.dtype)
+            grown[:self.frames] = buffer[:self.frames]
+            self._buffers[name] = grown
+
+    def add(self, result: FrameResult) -> None:
+        if self.first_timestamp is None:
+            self.first_timestamp = result.timestamp
+        self.last_timestamp = result.timestamp
+        self._reserve(self.frames + 1)
+        confidence = result.keypoints[:, 2]
+        self._buffers["timestamps"][self.frames] = result.timestamp
+        self._buffers["keypoints"][self.frames] = result.keypoints[:, :2]
+        self._buffers["confidence"][self.frames] = np.clip(confidence * 255 + 0.5, 0, 255)
+        self.confidence_sum += confidence
+        self.frames += 1
+
+    def merge(self, other: "RunAggregator") -> None:
+        """Append ``other``, which must cover the video right after this one."""
+        if other.frames == 0:
+            return
+        if self.first_timestamp is None:
+            self.first_timestamp = other.first_timestamp
+        self.last_timestamp = other.last_timestamp
+        self.confidence_sum += other.confidence_sum
+        total = self.frames + other.frames
+        self._reserve(total)
+        for name, buffer in self._buffers.items():
+            buffer[self.frames:total] = other._buffers[name][:other.frames]
+        self.frames = total
+
+    def trim(self) -> None:
+        """Drop unused buffer capacity, e.g. before pickling back to the parent."""
+        self._buffers = {name: buffer[:self.frames].copy() for name, buffer in self._buffers.items()}
+
+    def frame_arrays(self) -> dict[str, np.ndarray]:
+        """The per-frame series, stored next to the summary as a binary blob."""
+        return {name: buffer[:self.frames] for name, buffer in self._buffers.items()}
+
+    def summary(self) -> dict:
+        duration = self.last_timestamp - (self.first_timestamp or 0.0)
+        mean_confidence = self.confidence_sum / self.frames if self.frames else self.confidence_sum
+        summary = {
+            "frames_analyzed": self.frames,
+            "duration_seconds": round(duration, 3),
+            "mean_keypoint_confidence": [round(float(c), 4) for c in mean_confidence],
+        }
+        if self.frames > 1 and duration > 0:
+            fps = (self.frames - 1) / duration
+            summary["metrics"] = compute_running_metrics(self._buffers["keypoints"][:self.frames], fps)
+        return summary
+
+
+def _stage_stats() -> list[StageStats]:
+    return [StageStats("decode"), StageStats("sample"), StageStats("inference"), StageStats("aggregate")]
+
+
+def _run_stages(
+        stream: BinaryIO,
+        model: PoseModel,
+        stages: list[StageStats],
+        start: float = 0.0,
+        end: float | None = None,
+        threaded: bool = True,
+        on_progress: Callable[[float], None] | None = None
+) -> RunAggregator:
+    decode_stats, sample_stats, inference_stats, aggregate_stats = stages
+
+    frames = decode_frames(stream, decode_stats, start=start, end=end, threaded=threaded)
+    decoded = bounded(frames, settings.VIDEO_PIPELINE_QUEUE_SIZE, "decode")
+    sampled = sample_frames(decoded, settings.VIDEO_SAMPLE_FPS, sample_stats)
+    results = run_inference(sampled, model, settings.VIDEO_INFERENCE_BATCH_SIZE, inference_stats)
+
+    aggregator = RunAggregator()
+    for result in results:
+        begin = time.perf_counter()
+        aggregator.add(result)
+        aggregate_stats.busy_seconds += time.perf_counter() - begin
+        aggregate_stats.frames += 1
+        if on_progress is not None:
+            on_progress(result.timestamp)
+    return aggregator
+
+
+def _summarize(aggregator: RunAggregator, stages: list[StageStats]) -> tuple[dict, dict[str, np.ndarray]]:
+    summary = aggregator.summary()
+    summary["pipeline"] = {stats.name: stats.as_dict() for stats in stages}
+    return summary, aggregator.frame_arrays()
+
+
+def analyze_video(
+        stream: BinaryIO,
+        model: PoseModel | None = None,
+        on_progress: Callable[[float], None] | None = None
+) -> tuple[dict, dict[str, np.ndarray]]:
+    """
+    Run the whole pipeline over an open video stream. Returns the summary
+    stored in Run.analysis_results and the per-frame arrays stored in
+    RunFrameData.
+
+    ``on_progress`` is called with the video timestamp of every analyzed frame.
+    """
+    stages = _stage_stats()
+    aggregator = _run_stages(stream, model or get_pose_model(), stages, on_progress=on_progress)
+    return _summarize(aggregator, stages)
+
+
+# --- Segment-parallel analysis ---
+
+def _init_segment_worker() -> None:
+    """
+    Runs as each pool process starts. Forked processes already hold the
+    model, so get_pose_model() returns at once; only under spawn does it load.
+    """
+    from app.services import storage
+
+    # A forked child must not share the parent's pooled HTTP connections
+    storage._supabase_client = None
+    get_pose_model()
+
+
+def analyze_segment(video_path: str, start: float, end: float) -> tuple[RunAggregator, list[StageStats]]:
+    """Analyze ``[start, end)`` seconds of a stored video; runs in a pool process."""
+    from app.services.video_storage import get_video_storage
+
+    stages = _stage_stats()
+    with get_video_storage().open(video_path) as stream:
+        aggregator = _run_stages(stream, get_pose_model(), stages, start=start, end=end, threaded=False)
+    aggregator.trim()
+    return aggregator, stages
+
+
+def plan_segments(duration: float, segment_seconds: float, sample_fps: float) -> list[tuple[float, float]]:
+    """
+    Split ``[0, duration)`` into consecutive segments. Boundaries are rounded
+    to whole sampling slots so no slot is sampled by two segments.
+    """
+    if sample_fps > 0:
+        segment_seconds = max(1, round(segment_seconds * sample_fps)) / sample_fps
+    edges = list(np.arange(0.0, duration, segment_seconds)) + [float("inf")]
+    return [(float(a), float(b)) for a, b in zip(edges, edges[1:])]
+
+
+def analyze_video_parallel(
+        video_path: str,
+        duration: float,
+        workers: int,
+        segment_seconds: float,
+        on_segment_done: Callable[[int, int], None] | None = None
+) -> tuple[dict, dict[str, np.ndarray]]:
+    """
+    Analyze a stored video as time segments across a process pool.
+
+    Each segment returns its raw keypoint series rather than finished
+    metrics. The series are concatenated in time order and the metrics run
+    once over the whole run, so steps and contacts that straddle a cut are
+    measured exactly as in a single pass.
+
+    ``on_segment_done`` is called with (segments done, total) as they finish.
+
+    The pool is forked from the calling process after the model is loaded,
+    so segment processes share it copy-on-write: the model is loaded once per
+    worker (by its startup hook, before work horses are forked), not once per
+    job and segment process. Spawn, which loads it in every pool process, is
+    only the fallback on platforms without fork. Segment processes never use
+    the database or Redis connections they inherit.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    segments = plan_segments(duration, segment_seconds, settings.VIDEO_SAMPLE_FPS)
+    get_pose_model()
+    start_method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    context = multiprocessing.get_context(start_method)
+    with ProcessPoolExecutor(
+            max_workers=min(workers, len(segments)),
+            mp_context=context,
+            initializer=_init_segment_worker
+    ) as pool:
+        futures = [pool.submit(analyze_segment, video_path, start, end) for start, end in segments]
+        for done, _ in enumerate(as_completed(futures), start=1):
+            if on_segment_done is not None:
+                on_segment_done(done, len(futures))
+        parts = [future.result() for future in futures]
+
+    aggregator = RunAggregator()
+    stages = _stage_stats()
+    for part, part_stages in parts:
+        aggregator.merge(part)
+        for total, stats in zip(stages, part_stages):
+            total.frames += stats.frames
+            total.busy_seconds += stats.busy_seconds
+
+    summary, frames = _summarize(aggregator, stages)
+    summary["segments"] = len(segments)
+    return summary, frames
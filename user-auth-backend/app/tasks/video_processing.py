@@ -1,13 +1,125 @@
 # app/tasks/video_processing.py
-import time
+import os
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.core.frame_codec import FRAME_QUANTIZATION, encode_frames
+from app.core.progress import COMPLETED, FAILED, RUNNING, ProgressReporter
+from app.core.queue import get_redis_conn
+from app.db.session import SessionLocal
+from app.tasks.dedup import HashingReader, copy_analysis, find_reusable_analysis, record_dedup
+from app.models.frame_data import RunFrameData
+from app.models.run import Run
+from app.services.video_storage import get_video_storage
 
 
 def analyze_run_video(run_id: int, video_path: str):
-    #placeholder
+    # Imported here so the web process can enqueue this task without loading
+    # PyAV and NumPy; only the RQ worker runs it.
+    from app.tasks.video_pipeline import analyze_video, analyze_video_parallel, probe_duration
+
+    with SessionLocal() as db:
+        row = db.execute(
+            select(Run.user_id, Run.client_digest, Run.model_version.is_not(None).label("analyzed"))
+            .where(Run.id == run_id)
+        ).first()
+    if row is None or row.analyzed:
+        # Run deleted meanwhile, or a duplicate delivery of an analyzed run
+        print(f"Skipping video analysis for run_id: {run_id}.")
+        return False
+
     print(f"Starting video analysis for run_id: {run_id}...")
+    progress = ProgressReporter(get_redis_conn(), run_id, row.user_id)
+    progress.update(RUNNING, stage="probing", percent=0)
+
+    try:
+        storage = get_video_storage()
+
+        # Verified sha256 of the upload, once something has read all of it
+        digest = None
+        if settings.VIDEO_DEDUP_ENABLED and row.client_digest is not None:
+            # The client's digest only finds a candidate; the video is read
+            # (and hashed) only if there is one, to confirm it before reuse
+            with SessionLocal() as db:
+                source_id = find_reusable_analysis(db, run_id, row.client_digest, settings.POSE_MODEL_VERSION)
+            if source_id is not None:
+                progress.update(RUNNING, stage="hashing", percent=0)
+                with storage.open(video_path) as stream:
+                    digest = HashingReader(stream).hexdigest(settings.VIDEO_READ_CHUNK_BYTES)
+                if digest != row.client_digest:
+                    print(f"Client digest of run_id {run_id} does not match the upload; analyzing it.")
+                    source_id = None
+                else:
+                    with SessionLocal() as db:
+                        copy_analysis(db, run_id, source_id, digest, settings.POSE_MODEL_VERSION)
+                        db.commit()
+            record_dedup(get_redis_conn(), hit=source_id is not None)
+            if source_id is not None:
+                progress.update(COMPLETED, percent=100)
+                print(f"Reused analysis of run_id {source_id} for run_id: {run_id}.")
+                return True
+
+        with storage.open(video_path) as stream:
+            duration = probe_duration(stream)
+
+        # Hash the bytes the single pass reads anyway, so later uploads of
+        # this video can reuse the results. Segments are read by separate
+        # processes, so long videos stay unhashed unless hashed above.
+        hash_video = settings.VIDEO_DEDUP_ENABLED and digest is None
+        workers = settings.VIDEO_ANALYSIS_WORKERS or os.cpu_count() or 1
+        if workers > 1 and duration > settings.VIDEO_SEGMENT_SECONDS:
+            results, frames = analyze_video_parallel(
+                video_path, duration, workers, settings.VIDEO_SEGMENT_SECONDS,
+                on_segment_done=lambda done, total: progress.update(
+                    RUNNING, stage="analyzing", percent=95 * done / total
+                )
+            )
+        else:
+            with storage.open(video_path) as stream:
+                reader = HashingReader(stream) if hash_video else stream
+                results, frames = analyze_video(
+                    reader,
+                    on_progress=lambda seconds: progress.update(
+                        RUNNING, stage="analyzing", percent=95 * min(1.0, seconds / duration) if duration else None,
+                        force=False
+                    )
+                )
+                if hash_video:
+                    digest = reader.hexdigest(settings.VIDEO_READ_CHUNK_BYTES)
+
+        for name, stats in results["pipeline"].items():
+            print(f"  {name:<10} {stats['frames']:6d} frames  {stats['fps']:8.1f} frames/s")
 
-    time.sleep(30)
+        progress.update(RUNNING, stage="saving", percent=95)
+        duration_seconds = results["duration_seconds"]
+        fps = (results["frames_analyzed"] - 1) / duration_seconds if duration_seconds else None
+        frame_data = {
+            "run_id": run_id,
+            "frames": results["frames_analyzed"],
+            "fps": fps,
+            # Dense per-frame series go into a compressed blob, not the JSONB
+            "data": encode_frames(
+                frames, meta={"model_version": settings.POSE_MODEL_VERSION}, quantize=FRAME_QUANTIZATION
+            ),
+        }
+        run_values = {"analysis_results": results, "model_version": settings.POSE_MODEL_VERSION}
+        if digest is not None:
+            run_values["content_digest"] = digest
+        with SessionLocal() as db:
+            db.execute(
+                insert(RunFrameData)
+                .values(**frame_data)
+                .on_conflict_do_update(index_elements=[RunFrameData.run_id], set_=frame_data)
+            )
+            db.execute(update(Run).where(Run.id == run_id).values(**run_values))
+            db.commit()
+    except Exception:
+        progress.update(FAILED)
+        raise
 
+    progress.update(COMPLETED, percent=100)
     print(f"Finished video analysis for run_id: {run_id}.")
 
-    return True
\ No newline at end of file
+    return True
@@ -0,0 +1,34 @@
+"""
+Worker startup hooks.
+
+Hooks run once in the RQ worker process before it starts taking jobs. In
+"fork" mode every work horse is forked from that process, so whatever the
+hooks load is shared copy-on-write instead of being loaded again per job.
+Hooks must not open sockets (database, Redis, HTTP); a connection created
+before the fork would be shared by every child.
+"""
+import importlib
+import time
+
+
+def load_pipeline() -> None:
+    """Import PyAV and NumPy and load the pose model."""
+    import av  # noqa: F401
+
+    from app.tasks.video_pipeline import get_pose_model
+
+    get_pose_model()
+
+
+def resolve_hook(path: str):
+    module_name, _, attr = path.partition(":")
+    if not module_name or not attr:
+        raise ValueError(f"Startup hook must look like 'module:function', got {path!r}")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def run_startup_hooks(paths: list[str]) -> None:
+    for path in paths:
+        started = time.perf_counter()
+        resolve_hook(path)()
+        print(f"✓ Startup hook {path} ({time.perf_counter() - started:.2f} s)")
@@ -0,0 +1,93 @@
+"""
+Requests/sec for GET /auth/me and POST /runs/ against a running server.
+
+Run it once against a checkout with the sync handlers and once against the
+async ones, with the same gunicorn/uvicorn settings and the same database:
+
+    python -m benchmarks.bench_async_routes --base-url http://localhost:8000 --label sync
+    python -m benchmarks.bench_async_routes --base-url http://localhost:8000 --label async
+
+POST /runs/ enqueues an analysis job per request, so point the server at a
+Redis instance nobody consumes from (or flush the queue afterwards).
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+
+async def _authenticate(client: httpx.AsyncClient) -> str:
+    email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+    password = "benchmark-password"
+    r = await client.post("/auth/signup", json={"email": email, "password": password})
+    r.raise_for_status()
+    r = await client.post("/auth/login", json={"email": email, "password": password})
+    r.raise_for_status()
+    return r.json()["access_token"]
+
+
+async def _hammer(client: httpx.AsyncClient, make_request, concurrency: int, duration: float) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def loop():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                r = await make_request()
+                if r.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(loop() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30) as client:
+        token = await _authenticate(client)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        def get_me():
+            return client.get("/auth/me", headers=headers)
+
+        def post_run():
+            payload = {"video_path": f"bench/{uuid.uuid4()}.mp4", "title": "benchmark"}
+            return client.post("/runs/", json=payload, headers=headers)
+
+        for name, make_request in (("GET /auth/me", get_me), ("POST /runs/", post_run)):
+            # short warm-up so pools and caches are populated before measuring
+            await _hammer(client, make_request, args.concurrency, min(2.0, args.duration))
+            result = await _hammer(client, make_request, args.concurrency, args.duration)
+            print(
+                f"[{args.label}] {name:<14} {result['rps']:8.1f} req/s  "
+                f"p50 {result['p50_ms']:7.2f} ms  p95 {result['p95_ms']:7.2f} ms  "
+                f"({result['requests']} requests, {result['errors']} errors)"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per endpoint")
+    parser.add_argument("--label", default="current", help="tag printed next to each result")
+    asyncio.run(main(parser.parse_args()))
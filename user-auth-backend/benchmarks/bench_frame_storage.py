@@ -0,0 +1,73 @@
+"""
+Storage size and encode/decode throughput of per-frame analysis data:
+plain JSON (what a JSONB column would hold) against the frame_codec blob.
+
+    python -m benchmarks.bench_frame_storage --minutes 60 --fps 10
+
+JSONB is stored roughly at its text size and TOAST-compressed with pglz;
+the zlib size of the JSON is shown as a stand-in for that.
+"""
+import argparse
+import json
+import time
+import zlib
+
+import numpy as np
+
+from app.core.frame_codec import FRAME_QUANTIZATION, FrameData, encode_frames
+from benchmarks.bench_running_metrics import synthetic_run
+
+
+def _best(fn, repeat: int) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main(args: argparse.Namespace) -> None:
+    keypoints = synthetic_run(args.minutes, args.fps)
+    frames = len(keypoints)
+    rng = np.random.default_rng(1)
+    arrays = {
+        "timestamps": (np.arange(frames) / args.fps).astype(np.float32),
+        "keypoints": keypoints,
+        "confidence": rng.integers(180, 256, size=(frames, keypoints.shape[1]), dtype=np.uint8),
+    }
+    as_json = {
+        "timestamps": [round(float(t), 3) for t in arrays["timestamps"]],
+        "keypoints": np.round(keypoints, 2).tolist(),
+        "confidence": (arrays["confidence"] / 255).round(2).tolist(),
+    }
+
+    json_encode_s, json_blob = _best(lambda: json.dumps(as_json).encode(), args.repeat)
+    json_decode_s, _ = _best(lambda: json.loads(json_blob), args.repeat)
+    lossless_encode_s, lossless = _best(lambda: encode_frames(arrays), args.repeat)
+    lossless_decode_s, _ = _best(lambda: [FrameData(lossless)[name] for name in arrays], args.repeat)
+    codec_encode_s, blob = _best(lambda: encode_frames(arrays, quantize=FRAME_QUANTIZATION), args.repeat)
+    codec_decode_s, decoded = _best(lambda: [FrameData(blob)[name] for name in arrays], args.repeat)
+    lazy_s, _ = _best(lambda: FrameData(blob)["timestamps"], args.repeat)
+    max_error = float(np.abs(decoded[1] - keypoints).max())
+
+    json_toast = len(zlib.compress(json_blob, 6))
+    raw_bytes = sum(a.nbytes for a in arrays.values())
+
+    print(f"{frames} frames x {keypoints.shape[1]} joints ({raw_bytes / 1e6:.1f} MB as raw arrays)")
+    print(f"{'format':<18}{'size':>12}{'encode':>14}{'decode':>14}")
+    print(f"{'JSON':<18}{len(json_blob) / 1e6:>10.2f}MB{json_encode_s * 1000:>12.1f}ms{json_decode_s * 1000:>12.1f}ms")
+    print(f"{'JSON (TOASTed)':<18}{json_toast / 1e6:>10.2f}MB")
+    print(f"{'codec, lossless':<18}{len(lossless) / 1e6:>10.2f}MB{lossless_encode_s * 1000:>12.1f}ms{lossless_decode_s * 1000:>12.1f}ms")
+    print(f"{'codec, quantized':<18}{len(blob) / 1e6:>10.2f}MB{codec_encode_s * 1000:>12.1f}ms{codec_decode_s * 1000:>12.1f}ms")
+    print(f"{'  one array':<18}{'':>12}{'':>14}{lazy_s * 1000:>12.1f}ms")
+    print(f"quantized blob is {len(json_blob) / len(blob):.1f}x smaller than JSON, "
+          f"{json_toast / len(blob):.1f}x smaller than TOASTed JSON; max keypoint error {max_error:.4f} px")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=60.0)
+    parser.add_argument("--fps", type=float, default=10.0, help="sampled frames per second")
+    parser.add_argument("--repeat", type=int, default=3)
+    main(parser.parse_args())
@@ -0,0 +1,62 @@
+"""
+Per-request overhead of the auth rate limiter: the Lua sliding window on
+Redis (REDIS_URL from the environment / .env) and the in-memory fallback.
+
+    python -m benchmarks.bench_rate_limit --count 20000 --concurrency 32
+
+Each check uses a different identity, so no request is rejected and every
+call does the full check-and-increment.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from app.core.rate_limit import Limit, SlidingWindowLimiter
+
+
+async def _measure(hit, count: int, concurrency: int) -> tuple[float, float]:
+    """Mean latency of sequential calls, and calls/s with ``concurrency`` in flight."""
+    started = time.perf_counter()
+    for i in range(count):
+        await hit(str(i))
+    sequential = (time.perf_counter() - started) / count
+
+    queue = iter(range(count))
+
+    async def loop():
+        for i in queue:
+            await hit(f"c{i}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(loop() for _ in range(concurrency)))
+    return sequential, count / (time.perf_counter() - started)
+
+
+async def main(args: argparse.Namespace) -> None:
+    limit = Limit("bench", requests=1_000_000, window=60)
+    # Fresh prefix per run so counters from an earlier run do not interfere
+    limiter = SlidingWindowLimiter(prefix=f"rate-limit-bench:{uuid.uuid4().hex[:8]}")
+
+    async def memory_hit(identity):
+        return limiter._hit_memory(f"bench:{identity}", limit)
+
+    async def redis_hit(identity):
+        return await limiter._hit_redis(f"{limiter._prefix}:{{{identity}}}", limit)
+
+    paths = [("memory", memory_hit)]
+    if not args.memory_only:
+        paths.append(("redis", redis_hit))
+
+    for name, hit in paths:
+        await hit("warmup")
+        mean, throughput = await _measure(hit, args.count, args.concurrency)
+        print(f"{name:<7} {mean * 1e6:9.1f} us/check sequential  {throughput:10.0f} checks/s at {args.concurrency} in flight")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--memory-only", action="store_true", help="skip Redis")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,56 @@
+"""
+Time compute_running_metrics on a synthetic run.
+
+The default is 60 minutes at 60 fps (216,000 frames x 17 joints), which
+should take well under a second:
+
+    python -m benchmarks.bench_running_metrics --minutes 60 --fps 60
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.tasks.running_metrics import LEFT_ANKLE, LEFT_HIP, RIGHT_ANKLE, RIGHT_HIP, compute_running_metrics
+
+
+def synthetic_run(minutes: float, fps: float, cadence_spm: float = 170.0, seed: int = 0) -> np.ndarray:
+    """Side-on runner: ankles swing and lift once per stride, hips bob once per step."""
+    rng = np.random.default_rng(seed)
+    frames = int(minutes * 60 * fps)
+    t = np.arange(frames) / fps
+    stride_hz = cadence_spm / 120.0
+
+    keypoints = np.full((frames, 17, 2), [500.0, 200.0], dtype=np.float32)
+    hip_y = 300.0 + 5.0 * np.sin(2 * np.pi * 2 * stride_hz * t)
+    for hip, ankle, phase in ((LEFT_HIP, LEFT_ANKLE, 0.0), (RIGHT_HIP, RIGHT_ANKLE, np.pi)):
+        cycle = 2 * np.pi * stride_hz * t + phase
+        keypoints[:, hip, 0] = 500.0
+        keypoints[:, hip, 1] = hip_y
+        keypoints[:, ankle, 0] = 500.0 + 60.0 * np.cos(cycle)
+        keypoints[:, ankle, 1] = 480.0 - 40.0 * np.clip(np.sin(cycle), 0.0, None)
+    keypoints += rng.normal(0.0, 0.5, keypoints.shape).astype(np.float32)
+    return keypoints
+
+
+def main(args: argparse.Namespace) -> None:
+    keypoints = synthetic_run(args.minutes, args.fps)
+    print(f"{keypoints.shape[0]} frames, {keypoints.nbytes / 1e6:.0f} MB of keypoints")
+
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        metrics = compute_running_metrics(keypoints, args.fps)
+        timings.append(time.perf_counter() - started)
+
+    print(f"best {min(timings) * 1000:.1f} ms, mean {np.mean(timings) * 1000:.1f} ms over {args.repeat} runs")
+    print({key: value for key, value in metrics.items() if key != "splits"})
+    print(f"{len(metrics.get('splits', []))} splits")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=60.0)
+    parser.add_argument("--fps", type=float, default=60.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
@@ -0,0 +1,119 @@
+"""
+Time to turn a run with a ~1 MB analysis_results document into a response
+body, for the default response_model path and the FAST_RESPONSES_ENABLED
+paths, plus the cost and effect of compressing it.
+
+    python -m benchmarks.bench_serialization --size-mb 1 --repeat 20
+
+"load" is json.loads of the JSONB text, which SQLAlchemy does for the
+default path before any encoding starts; the passthrough path skips it.
+"""
+import argparse
+import gzip
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import brotli
+from pydantic import TypeAdapter
+
+from app.core.responses import dump_model, dumps, splice_json
+from app.runs.schemas import RunListItem, RunOut
+
+
+def synthetic_results(size_mb: float) -> dict:
+    """Summary metrics plus per-second series, roughly ``size_mb`` as JSON."""
+    rng = random.Random(1)
+    results = {
+        "summary": {"cadence_spm": 171.3, "distance_m": 10012.4, "duration_seconds": 3600.0},
+        "pipeline": {"decode": {"frames": 36000, "fps": 812.5}},
+        "series": [],
+    }
+    target = size_mb * 1024 * 1024
+    size = 0
+    while size < target:
+        point = {
+            "t": round(len(results["series"]) * 0.1, 1),
+            "cadence": round(rng.uniform(160, 185), 2),
+            "vertical_oscillation_cm": round(rng.uniform(6, 11), 3),
+            "ground_contact_ms": round(rng.uniform(180, 260), 1),
+            "lean_deg": round(rng.uniform(2, 9), 2),
+        }
+        results["series"].append(point)
+        size += len(json.dumps(point)) + 2
+    return results
+
+
+def _median_ms(fn, repeat: int) -> tuple[float, object]:
+    samples, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000, result
+
+
+def main(args: argparse.Namespace) -> None:
+    results = synthetic_results(args.size_mb)
+    jsonb_text = json.dumps(results)  # what Postgres returns for the column as text
+    run = SimpleNamespace(
+        id=1, title="Sunday long run", video_path="user-1/video.mp4",
+        created_at=datetime.now(timezone.utc), user_id=1, analysis_results=results
+    )
+    run_out = TypeAdapter(RunOut)
+    run_item = TypeAdapter(RunListItem)
+
+    def load():
+        return json.loads(jsonb_text)
+
+    def default_path():
+        # What FastAPI does with response_model=RunOut and the default JSONResponse
+        content = RunOut.model_validate(run, from_attributes=True).model_dump(mode="json")
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+    def summary():
+        return dump_model(
+            run_item, RunListItem,
+            id=run.id, title=run.title, video_path=run.video_path, created_at=run.created_at, user_id=run.user_id
+        )
+
+    def adapter_path():
+        return dump_model(run_out, RunOut, **vars(run))
+
+    def orjson_path():
+        return splice_json(summary(), "analysis_results", dumps(results))
+
+    def passthrough_path():
+        return splice_json(summary(), "analysis_results", jsonb_text)
+
+    load_ms, _ = _median_ms(load, args.repeat)
+    print(f"document {len(jsonb_text) / 1e6:.2f} MB; load (json.loads of JSONB text) {load_ms:7.2f} ms\n")
+    print(f"{'path':<30} {'encode':>9} {'with load':>10}")
+    for name, fn, needs_load in (
+            ("default response_model", default_path, True),
+            ("TypeAdapter, no validation", adapter_path, True),
+            ("orjson document", orjson_path, True),
+            ("JSONB text passthrough", passthrough_path, False),
+    ):
+        ms, body = _median_ms(fn, args.repeat)
+        total = ms + (load_ms if needs_load else 0)
+        print(f"{name:<30} {ms:7.2f} ms {total:7.2f} ms  ({len(body) / 1e6:.2f} MB)")
+
+    body = passthrough_path()
+    print()
+    for name, compress in (
+            ("gzip level 6", lambda: gzip.compress(body, compresslevel=6)),
+            ("brotli quality 4", lambda: brotli.compress(body, quality=4)),
+    ):
+        ms, compressed = _median_ms(compress, args.repeat)
+        print(f"{name:<30} {ms:7.2f} ms  {len(compressed) / 1e6:.3f} MB ({len(body) / len(compressed):.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=20)
+    main(parser.parse_args())
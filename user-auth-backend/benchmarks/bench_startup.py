@@ -0,0 +1,50 @@
+"""
+Cold-start cost of an API worker, split into importing app.main and running
+its lifespan startup. Each sample is a fresh interpreter, like a new
+gunicorn worker:
+
+    python -m benchmarks.bench_startup --samples 10
+
+Needs the same environment the server runs with (.env). Redis and Supabase
+do not have to be reachable.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+_PROBE = r"""
+import asyncio, json, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+
+async def startup():
+    async with app.main.app.router.lifespan_context(app.main.app):
+        return time.perf_counter()
+
+ready = asyncio.run(startup())
+print(json.dumps({"import": imported - started, "lifespan": ready - imported}))
+"""
+
+
+def _sample() -> dict:
+    out = subprocess.run([sys.executable, "-c", _PROBE], check=True, capture_output=True, text=True).stdout
+    # The app prints startup lines; the measurement is the last line
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(args: argparse.Namespace) -> None:
+    samples = [_sample() for _ in range(args.samples)]
+    for phase in ("import", "lifespan"):
+        values = [s[phase] * 1000 for s in samples]
+        print(f"{phase:<9} median {statistics.median(values):8.1f} ms  max {max(values):8.1f} ms")
+    total = [(s["import"] + s["lifespan"]) * 1000 for s in samples]
+    print(f"{'total':<9} median {statistics.median(total):8.1f} ms  ({args.samples} fresh interpreters)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=10)
+    main(parser.parse_args())
@@ -0,0 +1,45 @@
+"""
+Throughput of decode_access_token with and without the verified-token cache.
+
+Runs in-process, no server needed (settings still come from .env):
+
+    python -m benchmarks.bench_token_decode --iterations 200000 --tokens 100
+
+--tokens controls how many distinct tokens are cycled through, i.e. how many
+clients are sharing the worker.
+"""
+import argparse
+import time
+
+from app.core.config import settings
+from app.core.security import create_access_token, decode_access_token, token_cache
+
+
+def _run(tokens: list[str], iterations: int) -> float:
+    started = time.perf_counter()
+    for i in range(iterations):
+        if decode_access_token(tokens[i % len(tokens)]) is None:
+            raise RuntimeError("token failed to decode")
+    return iterations / (time.perf_counter() - started)
+
+
+def main(args: argparse.Namespace) -> None:
+    tokens = [create_access_token(sub=str(i)) for i in range(args.tokens)]
+
+    settings.TOKEN_CACHE_ENABLED = False
+    uncached = _run(tokens, args.iterations)
+
+    settings.TOKEN_CACHE_ENABLED = True
+    token_cache.clear()
+    cached = _run(tokens, args.iterations)
+
+    print(f"uncached {uncached:12.0f} decodes/s")
+    print(f"cached   {cached:12.0f} decodes/s  ({cached / uncached:.1f}x)")
+    print(f"cache    {token_cache.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200_000)
+    parser.add_argument("--tokens", type=int, default=100, help="distinct tokens cycled through")
+    main(parser.parse_args())
@@ -0,0 +1,46 @@
+"""
+Per-URL latency of signed upload URLs against a running server: one URL per
+request versus the batch endpoint.
+
+    python -m benchmarks.bench_upload_urls --base-url http://localhost:8000 --count 10
+
+Point the server at a real Supabase project; with VIDEO_STORAGE_BACKEND=local
+this only measures the API itself.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from benchmarks.bench_async_routes import _authenticate
+
+
+async def main(args: argparse.Namespace) -> None:
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=30) as client:
+        headers = {"Authorization": f"Bearer {await _authenticate(client)}"}
+
+        single, batch = [], []
+        for _ in range(args.rounds):
+            started = time.perf_counter()
+            for _ in range(args.count):
+                r = await client.post("/auth/generate-upload-url", headers=headers)
+                r.raise_for_status()
+            single.append((time.perf_counter() - started) / args.count)
+
+            started = time.perf_counter()
+            r = await client.post("/auth/generate-upload-urls", json={"count": args.count}, headers=headers)
+            r.raise_for_status()
+            batch.append((time.perf_counter() - started) / args.count)
+
+        print(f"one per request  {statistics.median(single) * 1000:8.2f} ms per URL")
+        print(f"batch of {args.count:<7} {statistics.median(batch) * 1000:8.2f} ms per URL")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--count", type=int, default=10, help="URLs per round")
+    parser.add_argument("--rounds", type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,45 @@
+"""
+Bulk import throughput against the configured DATABASE_URL, by number of
+hashing processes:
+
+    python -m benchmarks.bench_user_import --users 2000 --workers 1,2,4,8
+
+Every run imports fresh synthetic emails, so it leaves --users rows per
+worker count in the users table; use a scratch database. Use --rounds to
+trade realism for a shorter run.
+"""
+import argparse
+import io
+import time
+import uuid
+
+from app.core.config import settings
+from app.services.user_import import import_users
+
+
+def synthetic_csv(count: int) -> str:
+    tag = uuid.uuid4().hex[:8]
+    rows = ["email,password"] + [f"import-{tag}-{i}@example.com,password-{i:06d}" for i in range(count)]
+    return "\n".join(rows) + "\n"
+
+
+def main(args: argparse.Namespace) -> None:
+    if args.rounds:
+        settings.BCRYPT_ROUNDS = args.rounds
+    print(f"bcrypt cost {settings.BCRYPT_ROUNDS}, {args.users} users per run")
+    baseline = None
+    for workers in (int(w) for w in args.workers.split(",")):
+        started = time.perf_counter()
+        report = import_users(io.StringIO(synthetic_csv(args.users)), "csv", workers=workers, method=args.method)
+        rate = report.created / (time.perf_counter() - started)
+        baseline = baseline or rate
+        print(f"{workers:3d} workers  {rate:8.1f} users/s  x{rate / baseline:4.1f}  ({report.created} created, {report.failed} failed)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--rounds", type=int, help="bcrypt cost override, e.g. 10")
+    parser.add_argument("--method", choices=("copy", "insert"))
+    main(parser.parse_args())
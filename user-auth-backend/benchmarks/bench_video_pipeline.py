@@ -0,0 +1,62 @@
+"""
+Per-stage throughput, wall clock and peak memory of the video analysis pipeline.
+
+Reads a video through LocalVideoStorage, so no Supabase access is needed:
+
+    python -m benchmarks.bench_video_pipeline --root ./videos --video sample.mp4
+    python -m benchmarks.bench_video_pipeline --root ./videos --video hour.mp4 --workers 1 2 4 8
+
+Run the single pass on a short and a long clip; peak RSS should stay roughly
+the same. With --workers, the video is analyzed in segments across that many
+processes, and wall clock should drop close to linearly with the count.
+"""
+import argparse
+import os
+import resource
+import time
+
+
+def main(args: argparse.Namespace) -> None:
+    # Set before importing the app so spawned segment workers see them too
+    os.environ["VIDEO_STORAGE_BACKEND"] = "local"
+    os.environ["VIDEO_STORAGE_LOCAL_ROOT"] = args.root
+
+    from app.services.video_storage import get_video_storage
+    from app.tasks.video_pipeline import analyze_video, analyze_video_parallel, probe_duration
+
+    storage = get_video_storage()
+
+    if not args.workers:
+        started = time.perf_counter()
+        with storage.open(args.video) as stream:
+            results, _ = analyze_video(stream)
+        elapsed = time.perf_counter() - started
+
+        for name, stats in results["pipeline"].items():
+            print(f"{name:<10} {stats['frames']:7d} frames  {stats['fps']:9.1f} frames/s  ({stats['seconds']:.2f} s busy)")
+        # ru_maxrss is in kilobytes on Linux
+        peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"total      {elapsed:.2f} s wall, peak RSS {peak_mb:.0f} MB")
+        return
+
+    with storage.open(args.video) as stream:
+        duration = probe_duration(stream)
+    baseline = None
+    for workers in args.workers:
+        started = time.perf_counter()
+        results, _ = analyze_video_parallel(args.video, duration, workers, args.segment_seconds)
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed * workers
+        print(
+            f"{workers:3d} workers  {elapsed:8.2f} s wall  {results['segments']} segments  "
+            f"efficiency {baseline / (elapsed * workers):.0%}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", default=".", help="directory the video path is relative to")
+    parser.add_argument("--video", required=True)
+    parser.add_argument("--workers", type=int, nargs="*", help="process counts to compare")
+    parser.add_argument("--segment-seconds", type=float, default=300.0)
+    main(parser.parse_args())
@@ -0,0 +1,68 @@
+"""
+Per-job overhead of a cold fork, a warm (preloaded) fork and an in-process worker.
+
+No Redis needed: this forks the way rq.Worker does and runs one tiny
+inference per job, so the numbers are the fixed cost a job pays before doing
+any real work.
+
+    python -m benchmarks.bench_worker_overhead --jobs 20
+
+cold   fork from a parent that has loaded nothing; each job imports and loads
+warm   run the startup hooks first, then fork (WORKER_MODE=fork)
+simple no fork, jobs run in the long-lived process (WORKER_MODE=simple)
+"""
+import argparse
+import os
+import statistics
+import time
+
+
+def _job() -> None:
+    import numpy as np
+
+    from app.tasks.video_pipeline import get_pose_model
+
+    get_pose_model().predict([np.zeros((256, 256, 3), dtype=np.uint8)])
+
+
+def _forked_job_seconds() -> float:
+    started = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            _job()
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+    return time.perf_counter() - started
+
+
+def _report(label: str, timings: list[float]) -> None:
+    print(
+        f"{label:<7} median {statistics.median(timings) * 1000:8.2f} ms  "
+        f"max {max(timings) * 1000:8.2f} ms  ({len(timings)} jobs)"
+    )
+
+
+def main(args: argparse.Namespace) -> None:
+    # Cold first: nothing from the app is imported in this process yet
+    _report("cold", [_forked_job_seconds() for _ in range(args.jobs)])
+
+    from app.core.config import settings
+    from app.tasks.warmup import run_startup_hooks
+
+    run_startup_hooks(settings.WORKER_STARTUP_HOOKS)
+    _report("warm", [_forked_job_seconds() for _ in range(args.jobs)])
+
+    timings = []
+    for _ in range(args.jobs):
+        started = time.perf_counter()
+        _job()
+        timings.append(time.perf_counter() - started)
+    _report("simple", timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=20)
+    main(parser.parse_args())
@@ -0,0 +1,11 @@
+"""
+Reproducible load test of the API against local stand-ins (SQLite or a local
+Postgres, fakeredis, filesystem storage).
+
+    python -m benchmarks.loadtest --out before.json
+    # ... change something ...
+    python -m benchmarks.loadtest --out after.json
+    python -m benchmarks.loadtest.compare before.json after.json
+
+See server.py for the stand-ins and scenarios.py for the workloads.
+"""
@@ -0,0 +1,170 @@
+"""
+Start the API with local stand-ins, run the scripted scenarios against it and
+write p50/p95/p99 latency and throughput per scenario as JSON.
+
+    python -m benchmarks.loadtest --out results.json
+    python -m benchmarks.loadtest --scenarios me_steady,list_runs --duration 30
+    python -m benchmarks.loadtest --database-url postgresql://localhost/loadtest
+
+Each scenario's setup (creating users and runs) is not measured; timed
+scenarios get a short warm-up first. Before them, benchmarks/loadtest/
+worker_smoke.py takes one run from POST /runs/ through the outbox and the
+analysis job, which the API scenarios alone never touch.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.loadtest.scenarios import SCENARIOS, Scenario
+
+RESULTS_VERSION = 1
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))]
+
+
+async def drive(client: httpx.AsyncClient, scenario: Scenario, duration: float) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(scenario.total_requests or sys.maxsize))
+    deadline = None if scenario.total_requests else time.perf_counter() + duration
+
+    async def loop():
+        nonlocal errors
+        for i in counter:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            start = time.perf_counter()
+            try:
+                r = await scenario.request(client, i)
+                if r.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(loop() for _ in range(scenario.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+    }
+
+
+def _git_revision() -> dict:
+    def git(*cmd):
+        return subprocess.run(["git", *cmd], capture_output=True, text=True, check=True).stdout.strip()
+
+    try:
+        return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--", "."))}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+
+async def _wait_until_ready(client: httpx.AsyncClient, server: subprocess.Popen, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("Load-test server exited during startup")
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("Load-test server did not become ready")
+
+
+async def run(args: argparse.Namespace) -> dict:
+    names = args.scenarios.split(",") if args.scenarios else list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})")
+
+    if not args.skip_worker_smoke:
+        # Its own interpreter, so app.main is not loaded, as in the worker
+        subprocess.run([sys.executable, "-m", "benchmarks.loadtest.worker_smoke"], check=True)
+
+    command = [sys.executable, "-m", "benchmarks.loadtest.server", "--port", str(args.port)]
+    if args.database_url:
+        command += ["--database-url", args.database_url]
+    server = subprocess.Popen(command)
+
+    results = {}
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=60) as client:
+            await _wait_until_ready(client, server)
+            for name in names:
+                scenario = SCENARIOS[name](args.concurrency)
+                await scenario.setup(client)
+                if not scenario.total_requests:
+                    await drive(client, scenario, min(2.0, args.duration))
+                result = await drive(client, scenario, args.duration)
+                results[name] = {"description": scenario.description, "concurrency": scenario.concurrency, **result}
+                print(
+                    f"{name:<14} {result['rps']:9.1f} req/s  p50 {result['p50_ms']:8.2f}  "
+                    f"p95 {result['p95_ms']:8.2f}  p99 {result['p99_ms']:8.2f} ms  "
+                    f"({result['requests']} requests, {result['errors']} errors)"
+                )
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    return {
+        "version": RESULTS_VERSION,
+        "label": args.label,
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "git": _git_revision(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "database": "postgresql" if args.database_url else "sqlite",
+        },
+        "settings": {"concurrency": args.concurrency, "duration_s": args.duration},
+        "scenarios": results,
+    }
+
+
+def main(args: argparse.Namespace) -> None:
+    report = asyncio.run(run(args))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", help=f"comma separated, default all: {','.join(SCENARIOS)}")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per timed scenario")
+    parser.add_argument("--database-url", help="local Postgres to use instead of a fresh SQLite file")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--label", default="current", help="free-form tag stored in the results")
+    parser.add_argument("--out", help="write the results as JSON to this file")
+    parser.add_argument("--skip-worker-smoke", action="store_true", help="skip the end-to-end run analysis check")
+    main(parser.parse_args())
@@ -0,0 +1,55 @@
+"""
+Compare two load-test result files, e.g. from two commits:
+
+    python -m benchmarks.loadtest.compare before.json after.json --fail-above 10
+
+Prints throughput and latency percentiles side by side. With --fail-above,
+exits non-zero when any scenario's p95 got worse by more than that many
+percent, so it can gate CI.
+"""
+import argparse
+import json
+import sys
+
+METRICS = ("rps", "p50_ms", "p95_ms", "p99_ms")
+
+
+def _change(before: float, after: float) -> float | None:
+    return (after - before) / before * 100 if before else None
+
+
+def main(args: argparse.Namespace) -> int:
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+
+    print(f"before: {before.get('label')} {before['git'].get('commit')}")
+    print(f"after:  {after.get('label')} {after['git'].get('commit')}")
+    regressions = []
+    for name, new in after["scenarios"].items():
+        old = before["scenarios"].get(name)
+        if old is None:
+            print(f"\n{name}: only in {args.after}")
+            continue
+        print(f"\n{name}")
+        for metric in METRICS:
+            change = _change(old[metric], new[metric])
+            shown = f"{change:+7.1f}%" if change is not None else "      -"
+            print(f"  {metric:<7} {old[metric]:10.2f} -> {new[metric]:10.2f}  {shown}")
+        p95_change = _change(old["p95_ms"], new["p95_ms"])
+        if args.fail_above is not None and p95_change is not None and p95_change > args.fail_above:
+            regressions.append(f"{name} p95 {p95_change:+.1f}%")
+
+    if regressions:
+        print(f"\nRegressions above {args.fail_above}%: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--fail-above", type=float, help="p95 regression threshold in percent")
+    sys.exit(main(parser.parse_args()))
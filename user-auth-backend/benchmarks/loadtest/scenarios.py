@@ -0,0 +1,125 @@
+"""
+Scripted load-test workloads. A scenario prepares whatever state it needs in
+``setup`` (not measured), then ``request`` is called concurrently: either a
+fixed number of times (``total_requests``) or for the run's duration.
+"""
+import itertools
+import uuid
+
+import httpx
+
+PASSWORD = "loadtest-password"
+
+
+def _email(tag: str) -> str:
+    return f"{tag}-{uuid.uuid4().hex[:12]}@example.com"
+
+
+async def create_users(client: httpx.AsyncClient, count: int, tag: str) -> list[dict]:
+    """Sign up and log in ``count`` users; returns their emails and auth headers."""
+    users = []
+    for _ in range(count):
+        email = _email(tag)
+        r = await client.post("/auth/signup", json={"email": email, "password": PASSWORD})
+        r.raise_for_status()
+        r = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+        r.raise_for_status()
+        users.append({"email": email, "headers": {"Authorization": f"Bearer {r.json()['access_token']}"}})
+    return users
+
+
+class Scenario:
+    name = ""
+    description = ""
+    # Creates data per request, so it runs a fixed count instead of a duration
+    total_requests: int | None = None
+
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+
+    async def setup(self, client: httpx.AsyncClient) -> None:
+        pass
+
+    def request(self, client: httpx.AsyncClient, i: int):
+        raise NotImplementedError
+
+
+class SignupStorm(Scenario):
+    name = "signup_storm"
+    description = "POST /auth/signup with new emails; bcrypt-bound"
+
+    def __init__(self, concurrency: int, total_requests: int = 200):
+        super().__init__(concurrency)
+        self.total_requests = total_requests
+
+    def request(self, client, i):
+        return client.post("/auth/signup", json={"email": _email("storm"), "password": PASSWORD})
+
+
+class LoginBurst(Scenario):
+    name = "login_burst"
+    description = "POST /auth/login for a pool of existing users"
+
+    async def setup(self, client):
+        self.users = await create_users(client, min(self.concurrency, 32), "login")
+
+    def request(self, client, i):
+        user = self.users[i % len(self.users)]
+        return client.post("/auth/login", json={"email": user["email"], "password": PASSWORD})
+
+
+class MeSteadyState(Scenario):
+    name = "me_steady"
+    description = "GET /auth/me with valid tokens; token and user caches warm"
+
+    async def setup(self, client):
+        self.users = await create_users(client, 8, "me")
+
+    def request(self, client, i):
+        return client.get("/auth/me", headers=self.users[i % len(self.users)]["headers"])
+
+
+class CreateRun(Scenario):
+    name = "create_run"
+    description = "POST /runs/: insert the run and its analysis outbox row"
+
+    async def setup(self, client):
+        self.users = await create_users(client, 8, "create")
+
+    def request(self, client, i):
+        payload = {"video_path": f"loadtest/{uuid.uuid4()}.mp4", "title": "load test"}
+        return client.post("/runs/", json=payload, headers=self.users[i % len(self.users)]["headers"])
+
+
+class ListRuns(Scenario):
+    name = "list_runs"
+    description = "GET /runs/ first pages and follow-up pages of a 500-run history"
+
+    async def setup(self, client):
+        (self.user,) = await create_users(client, 1, "list")
+        for n in range(500):
+            r = await client.post(
+                "/runs/", json={"video_path": f"loadtest/{uuid.uuid4()}.mp4", "title": f"run {n}"},
+                headers=self.user["headers"]
+            )
+            r.raise_for_status()
+        # Cursors of the first pages, so requests can start mid-history
+        self.cursors = [None]
+        r = await client.get("/runs/", params={"limit": 20}, headers=self.user["headers"])
+        for _ in range(5):
+            cursor = r.json()["next_cursor"]
+            self.cursors.append(cursor)
+            r = await client.get("/runs/", params={"limit": 20, "cursor": cursor}, headers=self.user["headers"])
+        self._cycle = itertools.cycle(self.cursors)
+
+    def request(self, client, i):
+        params = {"limit": 20}
+        cursor = next(self._cycle)
+        if cursor:
+            params["cursor"] = cursor
+        return client.get("/runs/", params=params, headers=self.user["headers"])
+
+
+SCENARIOS: dict[str, type[Scenario]] = {
+    cls.name: cls for cls in (SignupStorm, LoginBurst, MeSteadyState, CreateRun, ListRuns)
+}
@@ -0,0 +1,73 @@
+"""
+Runs app.main:app under uvicorn against local stand-ins, for the load test:
+
+- the database given by --database-url, or a fresh SQLite file
+- fakeredis instead of Redis, shared by the sync and asyncio clients
+- the local filesystem as the video/upload storage backend
+
+    python -m benchmarks.loadtest.server --port 8765
+
+Normally started by ``python -m benchmarks.loadtest``. Needs the optional
+packages fakeredis and (for SQLite) aiosqlite on top of requirements.txt.
+"""
+import argparse
+import os
+import tempfile
+
+
+def configure_environment(database_url: str | None, workdir: str) -> None:
+    """Settings are read at import time, so this runs before app is imported."""
+    os.environ["DATABASE_URL"] = database_url or f"sqlite:///{os.path.join(workdir, 'loadtest.db')}"
+    os.environ.setdefault("JWT_SECRET", "loadtest-secret")
+    # Never used for a connection; get_redis_conn() is pre-seeded below
+    os.environ["REDIS_URL"] = "redis://fakeredis"
+    os.environ["VIDEO_STORAGE_BACKEND"] = "local"
+    os.environ["VIDEO_STORAGE_LOCAL_ROOT"] = os.path.join(workdir, "videos")
+    os.environ["CREATE_TABLES_ON_STARTUP"] = "true"
+    # Scenarios come from one address at rates far above the auth limits
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+
+
+def _install_sqlite_compat() -> None:
+    """Let create_all emit the Postgres-only column types on SQLite."""
+    from sqlalchemy.dialects.postgresql import JSONB
+    from sqlalchemy.ext.compiler import compiles
+
+    @compiles(JSONB, "sqlite")
+    def _jsonb_as_json(type_, compiler, **kw):
+        return "JSON"
+
+
+def _install_fake_redis() -> None:
+    import fakeredis
+
+    from app.core import progress, queue
+
+    server = fakeredis.FakeServer()
+    queue._redis_conn = fakeredis.FakeRedis(server=server)
+    progress._async_redis = fakeredis.FakeAsyncRedis(server=server)
+
+
+def main(args: argparse.Namespace) -> None:
+    workdir = args.workdir or tempfile.mkdtemp(prefix="loadtest-")
+    configure_environment(args.database_url, workdir)
+    os.makedirs(os.environ["VIDEO_STORAGE_LOCAL_ROOT"], exist_ok=True)
+
+    if os.environ["DATABASE_URL"].startswith("sqlite"):
+        _install_sqlite_compat()
+    _install_fake_redis()
+
+    import uvicorn
+
+    from app.main import app
+
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--database-url", help="sync SQLAlchemy URL; default: SQLite in --workdir")
+    parser.add_argument("--workdir", help="directory for the SQLite file and videos; default: a new temp dir")
+    main(parser.parse_args())
@@ -0,0 +1,184 @@
+"""
+End-to-end smoke check of run analysis, with the worker side in an
+interpreter that, like worker.py and dispatcher.py, never imports app.main:
+
+    python -m benchmarks.loadtest.worker_smoke
+
+Starts the load-test server on a fresh SQLite file and creates one run with
+a short synthetic video through POST /runs/, as a client would. This process
+then shares that database with the same stand-ins: it fails loudly if
+importing only the task modules leaves a model relationship unresolved
+(which the API process never notices because app.main loads every model),
+dispatches the run's outbox row, runs its job through analyze_run_video and
+reads the results back through GET /runs/{id}.
+
+``python -m benchmarks.loadtest`` runs this before its scenarios.
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+import httpx
+
+from benchmarks.loadtest.server import _install_fake_redis, _install_sqlite_compat, configure_environment
+
+PASSWORD = "smoke-password-1"
+
+
+def check_mappers() -> None:
+    from sqlalchemy.orm import configure_mappers
+
+    import app.tasks.outbox  # noqa: F401  (what dispatcher.py loads)
+    import app.tasks.video_processing  # noqa: F401  (what an RQ job loads)
+
+    assert "app.main" not in sys.modules, "the smoke check must not load the API"
+    configure_mappers()
+    print("mappers: ok")
+
+
+def write_video(path: str, seconds: int = 2, fps: int = 10, size: int = 64) -> None:
+    """A short video whose frames fade from black, written with PyAV."""
+    import av
+    import numpy as np
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with av.open(path, mode="w") as container:
+        stream = container.add_stream("mpeg4", rate=fps)
+        stream.width = stream.height = size
+        stream.pix_fmt = "yuv420p"
+        for i in range(seconds * fps):
+            image = np.full((size, size, 3), i * 255 // (seconds * fps), dtype=np.uint8)
+            for packet in stream.encode(av.VideoFrame.from_ndarray(image, format="rgb24")):
+                container.mux(packet)
+        for packet in stream.encode():
+            container.mux(packet)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workdir: str) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.loadtest.server", "--port", str(port), "--workdir", workdir]
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("Smoke-test server exited during startup")
+        try:
+            if httpx.get(f"{base_url}/health").status_code == 200:
+                return server, base_url
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("Smoke-test server did not become ready")
+
+
+def create_run(client: httpx.Client, video_path: str) -> int:
+    """Sign up, log in and create the run through the API; returns its id."""
+    email = f"smoke-{uuid.uuid4().hex[:12]}@example.com"
+    client.post("/auth/signup", json={"email": email, "password": PASSWORD}).raise_for_status()
+    r = client.post("/auth/login", json={"email": email, "password": PASSWORD})
+    r.raise_for_status()
+    client.headers["Authorization"] = f"Bearer {r.json()['access_token']}"
+
+    r = client.post("/runs/", json={"video_path": video_path, "title": "worker smoke"})
+    assert r.status_code == 201, f"POST /runs/ returned {r.status_code}: {r.text}"
+    run = r.json()
+    assert run["analysis_results"] is None, "a new run already has analysis results"
+    assert not is_analyzed(run["id"]), "a new run already counts as analyzed"
+    print(f"create run: ok (run {run['id']})")
+    return run["id"]
+
+
+def is_analyzed(run_id: int) -> bool:
+    """The worker's and the SSE endpoint's completion marker."""
+    from sqlalchemy import select
+
+    from app.db.session import SessionLocal
+    from app.models.run import Run
+
+    with SessionLocal() as db:
+        return bool(db.scalar(select(Run.model_version.is_not(None)).where(Run.id == run_id)))
+
+
+def check_dispatch(run_id: int) -> None:
+    from rq.job import Job
+    from sqlalchemy import select
+
+    from app.core.queue import get_queue
+    from app.db.session import SessionLocal
+    from app.models.outbox import RunAnalysisOutbox
+    from app.tasks.outbox import dispatch_pending, job_id_for_run
+
+    queue = get_queue()
+    claimed = dispatch_pending(queue, 10)
+    assert claimed >= 1, "dispatch_pending claimed nothing"
+    assert queue.connection.exists(Job.key_for(job_id_for_run(run_id))), "no job was enqueued for the run"
+    with SessionLocal() as db:
+        dispatched_at = db.scalar(
+            select(RunAnalysisOutbox.dispatched_at).where(RunAnalysisOutbox.run_id == run_id)
+        )
+    assert dispatched_at is not None, "outbox row still pending"
+    print(f"dispatch: ok ({claimed} row(s))")
+
+
+def check_job(client: httpx.Client, run_id: int) -> None:
+    """Run the dispatched job the way the worker does, in this process."""
+    from rq import SimpleWorker
+    from rq.job import Job
+
+    from app.core.queue import get_queue
+    from app.tasks.outbox import job_id_for_run
+
+    queue = get_queue()
+    SimpleWorker([queue], connection=queue.connection).work(burst=True)
+    job = Job.fetch(job_id_for_run(run_id), connection=queue.connection)
+    assert job.is_finished, f"analysis job ended as {job.get_status()}:\n{job.exc_info}"
+    assert is_analyzed(run_id), "the run is not marked analyzed"
+
+    r = client.get(f"/runs/{run_id}")
+    r.raise_for_status()
+    assert r.json()["analysis_results"] is not None, "GET /runs/{id} returns no analysis results"
+    print("analysis job: ok")
+
+
+def main(args: argparse.Namespace) -> None:
+    # Always a fresh SQLite database: a reused one can hold any number of
+    # pending outbox rows, and the dispatch below must claim this run's
+    workdir = tempfile.mkdtemp(prefix="worker-smoke-", dir=args.workdir)
+    server, base_url = start_server(workdir)
+    try:
+        configure_environment(None, workdir)
+        _install_sqlite_compat()
+        # One short video: analyze it in this process, not a segment pool
+        os.environ.setdefault("VIDEO_ANALYSIS_WORKERS", "1")
+        _install_fake_redis()
+
+        check_mappers()
+        video_path = f"smoke/{uuid.uuid4()}.mp4"
+        write_video(os.path.join(os.environ["VIDEO_STORAGE_LOCAL_ROOT"], video_path))
+        with httpx.Client(base_url=base_url, timeout=60) as client:
+            run_id = create_run(client, video_path)
+            check_dispatch(run_id)
+            check_job(client, run_id)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workdir", help="parent of the temp dir for the SQLite file and video; default: system temp")
+    main(parser.parse_args())
@@ -0,0 +1,41 @@
+# dispatcher.py
+#
+# Runs next to worker.py: moves committed runs from the run_analysis_outbox
+# table onto the RQ queue in batches. Safe to run more than one instance.
+
+import time
+from datetime import timedelta
+
+from sqlalchemy.orm import configure_mappers
+
+from app.core.config import settings
+from app.core.queue import get_queue
+from app.tasks.outbox import dispatch_pending, prune_dispatched
+
+
+if __name__ == '__main__':
+    print(f"Outbox dispatcher starting... batch size {settings.OUTBOX_BATCH_SIZE}")
+    # An unresolvable relationship would otherwise fail every pass below
+    # and leave the outbox pending forever, logged only as a dispatch error
+    configure_mappers()
+    retention = timedelta(hours=settings.OUTBOX_RETENTION_HOURS)
+    last_prune = 0.0
+
+    while True:
+        try:
+            dispatched = dispatch_pending(get_queue(), settings.OUTBOX_BATCH_SIZE)
+            if dispatched:
+                print(f"Dispatched {dispatched} analysis job(s)")
+
+            if time.monotonic() - last_prune > 3600:
+                prune_dispatched(retention)
+                last_prune = time.monotonic()
+        except Exception as e:
+            # Redis or the database is unavailable; pending rows stay in the
+            # outbox and are picked up on a later pass.
+            print(f"Outbox dispatch failed: {e}")
+            dispatched = 0
+
+        # A full batch means more are probably waiting, so go again right away
+        if dispatched < settings.OUTBOX_BATCH_SIZE:
+            time.sleep(settings.OUTBOX_POLL_SECONDS)
@@ -0,0 +1,13 @@
+# gunicorn.conf.py
+# Picked up automatically by gunicorn from the working directory.
+
+import os
+
+
+def child_exit(server, worker):
+    # Drop the exited worker's live gauges (DB pool usage) from the metrics
+    # sum; its counters and histograms are kept.
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -10,6 +10,8 @@ from sqlalchemy import create_engine, pool
 from app.db.base import Base
 from app.models.user import User
 from app.models.run import Run
+from app.models.outbox import RunAnalysisOutbox
+from app.models.frame_data import RunFrameData
 
 # --- Make project root importable ---
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))   # …/migrations
@@ -0,0 +1,33 @@
+"""Add runs (user_id, created_at, id) listing index
+
+Revision ID: 8c4d2e7a91b3
+Revises: 1efe93bb4f6e
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4d2e7a91b3'
+down_revision: Union[str, Sequence[str], None] = '1efe93bb4f6e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_runs_user_id_created_at_id",
+        "runs",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_runs_user_id_created_at_id", table_name="runs")
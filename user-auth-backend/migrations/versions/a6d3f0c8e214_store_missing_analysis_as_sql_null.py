@@ -0,0 +1,30 @@
+"""Store missing analysis_results as SQL NULL
+
+Revision ID: a6d3f0c8e214
+Revises: f2b9c4d61a07
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d3f0c8e214'
+down_revision: Union[str, Sequence[str], None] = 'f2b9c4d61a07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # POST /runs/ used to store the JSON value null, which reads as "analyzed"
+    op.execute(sa.text("UPDATE runs SET analysis_results = NULL WHERE jsonb_typeof(analysis_results) = 'null'"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Nothing to undo: SQL NULL is what the column meant all along
+    pass
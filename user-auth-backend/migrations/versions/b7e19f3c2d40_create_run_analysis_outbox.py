@@ -0,0 +1,44 @@
+"""Create run_analysis_outbox table
+
+Revision ID: b7e19f3c2d40
+Revises: 8c4d2e7a91b3
+Create Date: 2026-10-17 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e19f3c2d40'
+down_revision: Union[str, Sequence[str], None] = '8c4d2e7a91b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('run_analysis_outbox',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('run_id', sa.Integer(), nullable=False),
+    sa.Column('video_path', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('dispatched_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['run_id'], ['runs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_run_analysis_outbox_pending',
+        'run_analysis_outbox',
+        ['id'],
+        unique=False,
+        postgresql_where=sa.text('dispatched_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_run_analysis_outbox_pending', table_name='run_analysis_outbox')
+    op.drop_table('run_analysis_outbox')
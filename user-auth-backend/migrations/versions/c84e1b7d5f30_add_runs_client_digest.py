@@ -0,0 +1,34 @@
+"""Add runs client_digest
+
+Revision ID: c84e1b7d5f30
+Revises: a6d3f0c8e214
+Create Date: 2026-10-17 20:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c84e1b7d5f30'
+down_revision: Union[str, Sequence[str], None] = 'a6d3f0c8e214'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('runs', sa.Column('client_digest', sa.String(length=64), nullable=True))
+    # content_digest now only holds worker-verified digests; values that
+    # came from clients unverified must not be matched against
+    op.execute(sa.text(
+        "UPDATE runs SET client_digest = content_digest, content_digest = NULL "
+        "WHERE content_digest IS NOT NULL"
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('runs', 'client_digest')
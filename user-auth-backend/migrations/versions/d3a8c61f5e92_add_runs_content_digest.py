@@ -0,0 +1,37 @@
+"""Add runs content_digest and model_version
+
+Revision ID: d3a8c61f5e92
+Revises: b7e19f3c2d40
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a8c61f5e92'
+down_revision: Union[str, Sequence[str], None] = 'b7e19f3c2d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('runs', sa.Column('content_digest', sa.String(length=64), nullable=True))
+    op.add_column('runs', sa.Column('model_version', sa.String(length=64), nullable=True))
+    op.create_index(
+        'ix_runs_content_digest_model_version',
+        'runs',
+        ['content_digest', 'model_version'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_runs_content_digest_model_version', table_name='runs')
+    op.drop_column('runs', 'model_version')
+    op.drop_column('runs', 'content_digest')
@@ -0,0 +1,37 @@
+"""Create run_frame_data table
+
+Revision ID: e5f07b2a3c18
+Revises: d3a8c61f5e92
+Create Date: 2026-10-17 13:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f07b2a3c18'
+down_revision: Union[str, Sequence[str], None] = 'd3a8c61f5e92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('run_frame_data',
+    sa.Column('run_id', sa.Integer(), nullable=False),
+    sa.Column('frames', sa.Integer(), nullable=False),
+    sa.Column('fps', sa.Float(), nullable=True),
+    sa.Column('data', sa.LargeBinary(), nullable=False),
+    sa.ForeignKeyConstraint(['run_id'], ['runs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('run_id')
+    )
+    # The blob is already compressed; don't let TOAST try again
+    op.execute("ALTER TABLE run_frame_data ALTER COLUMN data SET STORAGE EXTERNAL")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('run_frame_data')
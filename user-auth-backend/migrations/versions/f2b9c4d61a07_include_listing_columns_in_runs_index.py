@@ -0,0 +1,43 @@
+"""Include title and video_path in the runs listing index
+
+Revision ID: f2b9c4d61a07
+Revises: e5f07b2a3c18
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b9c4d61a07'
+down_revision: Union[str, Sequence[str], None] = 'e5f07b2a3c18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # GET /runs/ also selects title and video_path; with them in the index
+    # the listing becomes an index-only scan
+    op.drop_index("ix_runs_user_id_created_at_id", table_name="runs")
+    op.create_index(
+        "ix_runs_user_id_created_at_id",
+        "runs",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+        postgresql_include=["title", "video_path"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_runs_user_id_created_at_id", table_name="runs")
+    op.create_index(
+        "ix_runs_user_id_created_at_id",
+        "runs",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
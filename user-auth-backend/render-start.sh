@@ -9,6 +9,19 @@ set -e
 echo "Running database migrations..."
 alembic upgrade head
 
+# Shared directory for the metrics of all Gunicorn workers, emptied on every
+# start so counters from a previous run are not summed in.
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus-multiproc}"
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
+# Pick the bcrypt cost for this hardware once, so all workers agree on it
+# (logins re-hash to whatever cost is current).
+if [ -n "$BCRYPT_TARGET_MS" ] && [ -z "$BCRYPT_ROUNDS" ]; then
+    export BCRYPT_ROUNDS="$(python -m app.core.security)"
+    echo "Calibrated bcrypt cost: $BCRYPT_ROUNDS (target ${BCRYPT_TARGET_MS} ms)"
+fi
+
 echo "Migrations complete. Starting Gunicorn server..."
 # This is the final command. It will start the web server, and the script
 # will continue to run as long as the server is running.
@@ -1,8 +1,14 @@
 # worker.py (Corrected and Improved Version)
 
 import os
+import time
 import redis
-from rq import Worker, Queue
+from rq import Worker, SimpleWorker, Queue
+from sqlalchemy.orm import configure_mappers
+
+from app.core.config import settings
+from app.core.metrics import RQ_JOB_DURATION, start_metrics_server
+from app.tasks.warmup import run_startup_hooks
 
 # This list defines which queues this worker will listen to.
 # 'default' is a standard choice.
@@ -17,15 +23,69 @@ if not redis_url:
 # Create the Redis connection object.
 conn = redis.from_url(redis_url)
 
+
+class JobMetricsMixin:
+    """
+    Records each job's duration and outcome. execute_job runs in the worker
+    process in both modes (it forks and waits in "fork" mode), so the
+    histogram lives in one long-lived process rather than one per work horse.
+    """
+
+    def execute_job(self, job, queue):
+        started = time.perf_counter()
+        try:
+            return super().execute_job(job, queue)
+        finally:
+            try:
+                status = job.get_status(refresh=True)
+                outcome = getattr(status, "value", status) or "unknown"
+            except Exception:
+                # Job expired or was deleted meanwhile
+                outcome = "unknown"
+            RQ_JOB_DURATION.labels(queue.name, job.func_name, outcome).observe(time.perf_counter() - started)
+
+
+class MetricsWorker(JobMetricsMixin, Worker):
+    pass
+
+
+class MetricsSimpleWorker(JobMetricsMixin, SimpleWorker):
+    pass
+
+
+WORKER_CLASSES = {
+    # Forks a work horse per job; hooks below have already run, so the
+    # children inherit the loaded model copy-on-write.
+    "fork": MetricsWorker,
+    # Runs jobs in this process, keeping the model warm between them.
+    "simple": MetricsSimpleWorker,
+}
+
 if __name__ == '__main__':
+    worker_class = WORKER_CLASSES.get(settings.WORKER_MODE)
+    if worker_class is None:
+        raise ValueError(f"Unknown WORKER_MODE: {settings.WORKER_MODE!r}")
+
+    if settings.WORKER_METRICS_PORT:
+        # Job durations plus the depth of the queues this worker serves
+        start_metrics_server(settings.WORKER_METRICS_PORT, queue_names=listen)
+
+    # Fail at startup, not on the first job, if a model relationship cannot
+    # be resolved; work horses also inherit the configured mappers.
+    import app.tasks.video_processing  # noqa: F401
+    configure_mappers()
+
+    # Load the model and other heavy state once, before any job runs.
+    run_startup_hooks(settings.WORKER_STARTUP_HOOKS)
+
     # Create a list of Queue objects to listen to.
     # We pass the connection object directly to the Queue constructor.
     queues = [Queue(name, connection=conn) for name in listen]
 
     # Create the Worker. We pass it the list of queues.
     # The worker will use the connection from the queues it is given.
-    worker = Worker(queues, connection=conn)
+    worker = worker_class(queues, connection=conn)
 
     # Start the worker process. It will now listen for jobs on the 'default' queue.
-    print(f"Worker starting... Listening on queues: {', '.join(listen)}")
-    worker.work()
\ No newline at end of file
+    print(f"Worker starting ({settings.WORKER_MODE} mode)... Listening on queues: {', '.join(listen)}")
+    worker.work()